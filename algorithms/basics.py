@@ -8,81 +8,214 @@
 
 from graph import *
 
+# All searches use an explicit stack of adjacency iterators instead of
+# recursion, so they work for arbitrarily long paths, and keep their state
+# in local sets/dicts/lists. The outgoing edges of a node are keyed by the
+# node at their other end, which also covers undirected edges.
+
+def _lookup(graph, n):
+    node = graph._node_lookup([n])
+    if node is None:
+        raise ValueError("No such node in this graph")
+    return node
+
+
 def depth_first_search(graph, s, t):
     """
     Find a path from the source to the target by using depth first search.
 
     Returns a path object connecting s and t or None if there is no such path.
     """
-    # initialization
-    for node in graph.nodes():
-        node.visited = False
+    if isinstance(graph, CSRGraph):
+        return _dfs_csr(graph, graph.node_index(s), graph.node_index(t))
 
-    # dfs from the start node
+    s, t = _lookup(graph, s), _lookup(graph, t)
+    visited = set([s])
     path = Path(s)
-    if not _dfs(graph, s, t, path):
-        path = None
-
-    # cleanup
-    for node in graph.nodes():
-        del node.visited
-
-    return path
-
-
-def _dfs(graph, cur, t, path):
-    cur.visited = True
-    for edge in cur.outgoing_edges():
-        n = edge.destination()
-        if not n.visited:
-            path.append(edge, n)
-            if n == t or _dfs(graph, n, t, path): 
-                return True
-            # continue with next neighbor
-            path.pop()
-                
-    # done with this node    
-    return False
+    stack = [iter(s._outgoing_edges.items())]
+    while stack:
+        for n, edge in stack[-1]:
+            if not n in visited:
+                visited.add(n)
+                path.append(edge, n)
+                if n is t:
+                    return path
+                stack.append(iter(n._outgoing_edges.items()))
+                break
+        else:
+            # done with this node
+            stack.pop()
+            if stack:
+                path.pop()
+
+    return None
+
+
+def reachable(graph, s):
+    """
+    Returns the list of nodes reachable from the given node/node name
+    (including itself) in depth first order.
+    """
+    if isinstance(graph, CSRGraph):
+        return [graph.node(v) for v in _reachable_csr(graph, graph.node_index(s))]
+
+    s = _lookup(graph, s)
+    visited = set([s])
+    res = [s]
+    stack = [iter(s._outgoing_edges.items())]
+    while stack:
+        for n, edge in stack[-1]:
+            if not n in visited:
+                visited.add(n)
+                res.append(n)
+                stack.append(iter(n._outgoing_edges.items()))
+                break
+        else:
+            stack.pop()
 
+    return res
 
 
 def has_cycles(graph):
     """
-    Returns a list of path objects, each making up a cycle in the provided graph.
+    Returns true if the provided graph contains a cycle in any of its components.
 
-    If there is no path and empty list will be returned.
+    An undirected edge is not considered a cycle by itself, see find_cycle().
     """
-    if graph.empty():
-        return []
+    return find_cycle(graph) is not None
 
-    # initialization
-    for node in graph.nodes():
-        node.color = "white"
 
-    # dfs from the first node
-    res = _dfs_cycle(graph, graph.nodes()[0], Path(graph.nodes()[0]))
+def find_cycle(graph):
+    """
+    Returns a path object making up a cycle in the provided graph or None if
+    there is no cycle.
 
-    # cleanup
-    for node in graph.nodes():
-        del node.color
+    Every component is searched. Undirected edges can be used in both
+    directions but are never walked back right after they were used.
+    """
+    if isinstance(graph, CSRGraph):
+        return _find_cycle_csr(graph)
+
+    grey, black = 1, 2
+    color = {}
+    for root in graph.nodes():
+        if root in color:
+            continue
+        color[root] = grey
+        # nodes on the current path, the edges leading to them and their adjacency iterators
+        nodes = [root]
+        edges = [None]
+        stack = [iter(root._outgoing_edges.items())]
+        while stack:
+            for n, edge in stack[-1]:
+                if edge is edges[-1]:
+                    continue    # the undirected edge we just came from
+                c = color.get(n)
+                if c is None:
+                    color[n] = grey
+                    nodes.append(n)
+                    edges.append(edge)
+                    stack.append(iter(n._outgoing_edges.items()))
+                    break
+                elif c == grey:
+                    # cycle detected, it starts where the path first visited n
+                    cycle = Path(n)
+                    for i in range(nodes.index(n) + 1, len(nodes)):
+                        cycle.append(edges[i], nodes[i])
+                    return cycle.append(edge, n)
+            else:
+                # done with this node
+                color[nodes.pop()] = black
+                edges.pop()
+                stack.pop()
+
+    return None
+
+
+def _dfs_csr(graph, s, t):
+    offsets, targets, arc_edge = graph.offsets, graph.targets, graph.arc_edge
+    visited = [False] * graph.node_count()
+    visited[s] = True
+    # arcs taken so far, the nodes on the path and the next arc to look at for each of them
+    path = []
+    nodes = [s]
+    stack = [offsets[s]]
+    while stack:
+        cur = nodes[-1]
+        a = stack[-1]
+        if a == offsets[cur + 1]:
+            # done with this node
+            nodes.pop()
+            stack.pop()
+            if path:
+                path.pop()
+            continue
+        stack[-1] = a + 1
+        n = targets[a]
+        if arc_edge[a] < 0 or visited[n]:
+            continue
+        visited[n] = True
+        path.append(a)
+        if n == t:
+            return graph.path(s, path)
+        nodes.append(n)
+        stack.append(offsets[n])
+
+    return None
+
+
+def _reachable_csr(graph, s):
+    offsets, targets, arc_edge = graph.offsets, graph.targets, graph.arc_edge
+    visited = [False] * graph.node_count()
+    visited[s] = True
+    res = [s]
+    stack = [s]
+    while stack:
+        cur = stack.pop()
+        for a in range(offsets[cur], offsets[cur + 1]):
+            n = targets[a]
+            if arc_edge[a] >= 0 and not visited[n]:
+                visited[n] = True
+                res.append(n)
+                stack.append(n)
 
     return res
 
 
-def _dfs_cycle(graph, cur, path):
-    cur.color = "grey"
-    for edge in cur.outgoing_edges():
-        n = edge.destination()
-        if n.color == "white":
-            path.append(edge, n)
-            if _dfs_cycle(graph, n, path):
-                return True
-            # continue with next neighbor
-            path.pop()
-        elif n.color == "grey":
-            # cycle detected
-            return True
-
-    # done with this node    
-    cur.color = "black"
-    return False
+def _find_cycle_csr(graph):
+    offsets, targets, reverse, arc_edge = graph.offsets, graph.targets, graph.reverse, graph.arc_edge
+    white, grey, black = 0, 1, 2
+    color = [white] * graph.node_count()
+    for root in range(graph.node_count()):
+        if color[root] != white:
+            continue
+        color[root] = grey
+        # arcs leading to the nodes on the current path, the nodes and the next arc to look at
+        path = [-1]
+        nodes = [root]
+        stack = [offsets[root]]
+        while stack:
+            cur = nodes[-1]
+            a = stack[-1]
+            if a == offsets[cur + 1]:
+                # done with this node
+                color[cur] = black
+                path.pop()
+                nodes.pop()
+                stack.pop()
+                continue
+            stack[-1] = a + 1
+            n = targets[a]
+            if arc_edge[a] < 0 or (path[-1] >= 0 and a == reverse[path[-1]]):
+                continue    # residual twin or the undirected edge we just came from
+            if color[n] == white:
+                color[n] = grey
+                path.append(a)
+                nodes.append(n)
+                stack.append(offsets[n])
+            elif color[n] == grey:
+                # cycle detected, it starts where the path first visited n
+                i = nodes.index(n)
+                return graph.path(n, path[i + 1:] + [a])
+
+    return None
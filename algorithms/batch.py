@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Solving many independent flow problems on a pool of worker processes.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+from graph import *
+from max_flow import _max_flow
+from min_cost_flow import _min_cost_flow
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+
+def _pack(instance):
+    """
+    Returns the compact form of a max flow ((graph, s, t) tuple) or
+    min cost flow (graph) instance: the graph as bytes and the source
+    and target node numbers (None for min cost flow).
+    """
+    if isinstance(instance, tuple):
+        graph, s, t = instance
+        csr = graph if isinstance(graph, CSRGraph) else graph.freeze(edge_attrs=("capacity",))
+        return csr.to_bytes(names=False), csr.node_index(s), csr.node_index(t)
+
+    graph = instance
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze(edge_attrs=("capacity", "cost"))
+    return csr.to_bytes(names=False), None, None
+
+
+def _solve(packed, method):
+    """
+    Solves a packed instance.
+
+    Returns the load of every edge and the value of the flow (max flow)
+    or its total costs (min cost flow), or None and the ValueError raised
+    by the solver for unsolvable instances.
+    """
+    data, s, t = packed
+    graph = CSRGraph.from_bytes(data)
+    arcs = graph.edge_arc
+    try:
+        if s is None:
+            flow = _min_cost_flow(graph, None, method or "cycle_cancelling")
+            value = sum( flow[a] * graph.cost[a] for a in arcs )
+        else:
+            flow = _max_flow(graph, s, t, None, method or "push_relabel")
+            value = sum( flow[a] for a in range(graph.offsets[s], graph.offsets[s + 1]) )
+    except ValueError as e:
+        return None, e
+
+    try:
+        loads = array("q", [flow[a] for a in arcs])
+    except (TypeError, OverflowError):
+        loads = array("d", [flow[a] for a in arcs])
+    return loads, value
+
+
+def solve_many(instances, method = None, workers = None, window = None):
+    """
+    Solves many independent flow problems on a pool of worker processes (all
+    cpus if workers is None, none if workers is 0).
+
+    Every instance is either a (graph, s, t) tuple for a max flow problem or a
+    graph for a min cost flow problem, graphs can be Graphs or CSRGraphs. The
+    instances are sent to the workers as compact byte strings (see
+    CSRGraph.to_bytes()). method selects the engine as for solve_max_flow()
+    or solve_min_cost_flow(), by default their default engine is used.
+
+    Returns a generator yielding one (loads, value) pair per instance in the
+    order of the instances, loads is an array with the load of every edge in
+    the order of graph.edges() and value is the value of the max flow or the
+    total costs of the min cost flow. For an instance the solver rejects with a ValueError (e.g.
+    because its demands can not be satisfied) the pair is None and the error,
+    the remaining instances are still solved. At most window (twice the number
+    of workers by default) instances are taken from the given iterable before
+    their results are delivered, so it can be a generator producing instances
+    on the fly.
+    """
+    if workers == 0:
+        for instance in instances:
+            yield _solve(_pack(instance), method)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    window = window or 2 * workers
+    pool = ProcessPoolExecutor(workers)
+    try:
+        pending = deque()
+        for instance in instances:
+            pending.append(pool.submit(_solve, _pack(instance), method))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        pool.shutdown()
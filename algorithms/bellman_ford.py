@@ -7,50 +7,244 @@
 #
 
 from graph import *
-import sys
+from collections import deque
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
-def bellman_ford_cycle(graph):
+
+class NegativeCycleError(ValueError):
+    """
+    Raised if a negative cost cycle makes shortest paths undefined.
+
+    The cycle is available as path in the cycle attribute.
+    """
+
+    def __init__(self, cycle):
+        ValueError.__init__(self, "negative cost cycle found")
+        self.cycle = cycle
+
+
+def bellman_ford(graph, source, attr = "cost"):
+    """
+    Calculates the shortest paths from the given source node/node name with
+    respect to the given edge attribute using the queue based variant of the
+    bellman ford algorithm.
+
+    Returns two dicts, the distance of every node reachable from the source
+    and the edge over which it is reached (None for the source itself).
+    Raises a NegativeCycleError if a negative cost cycle is reachable.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze(edge_attrs=(attr,))
+    dist, predecessor, cycle = _spfa_csr(csr, csr.arc_column(attr), [csr.node_index(source)])
+    if cycle is not None:
+        raise NegativeCycleError(csr.path(csr.sources[cycle[0]], cycle))
+
+    nodes, edges = csr.nodes(), csr.edges()
+    distances = {}
+    predecessors = {}
+    for v in range(csr.node_count()):
+        if dist[v] is not None:
+            distances[nodes[v]] = dist[v]
+            predecessors[nodes[v]] = None if predecessor[v] < 0 else edges[csr.arc_edge[predecessor[v]]]
+    return distances, predecessors
+
+
+def bellman_ford_cycle(graph, backend = "python"):
     """
     Runs the bellman ford algorithm to detect a negative cost cycle.
 
     The result is either a negative cost cycle or None if no such cycle exists in the given graph.
+
+    backend selects the implementation: "python" (default) for the queue based
+    variant or "numpy", which relaxes all edges of a round at once using NumPy
+    arrays and is much faster for large graphs. NumPy is an optional dependency,
+    a ValueError is raised if it is requested but not installed.
     """
-    res = None
-
-    # initialization
-    for node in graph.nodes():
-        node.dist = sys.maxsize
-        node.predecessor = None
-
-    # actual Bellman-Ford algorithm
-    for i in range(len(graph.nodes())):
-        for edge in graph.edges():
-            if edge.source().dist + edge.cost < edge.destination().dist:
-                edge.destination().dist = edge.source().dist + edge.cost
-                edge.destination().predecessor = edge.source()
-
-    # check for a negative cost cycles and reconstruct it
-    for edge in graph.edges():
-        if edge.source().dist + edge.cost < edge.destination().dist:
-            path = []
-            cur = edge.source()
-            while not cur in path:
-                path.append(cur)
-                cur = cur.predecessor
-            path.reverse()
-
-            cycle = Path(cur)
-            for node in path[:path.index(cur) + 1]:
-                cycle.append(node.edge_from(cur), node)
-                cur = node
-            
-            res = cycle
-            break
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze(edge_attrs=("cost",))
+    if backend == "python":
+        cycle = _negative_cycle_csr(csr, csr.cost)
+    elif backend == "numpy":
+        cycle = _negative_cycle_numpy(csr, csr.cost)
+    else:
+        raise ValueError("unknown bellman ford backend %s" % backend)
+    return None if cycle is None else csr.path(csr.sources[cycle[0]], cycle)
+
+
+def _predecessor_cycle(graph, predecessor):
+    """
+    Returns the list of arcs of a cycle in the graph formed by the given
+    predecessor arcs or None if there is no such cycle.
+    """
+    sources = graph.sources
+    mark = [-1] * graph.node_count()
+    for v in range(len(mark)):
+        u = v
+        while u >= 0 and mark[u] < 0:
+            mark[u] = v
+            u = sources[predecessor[u]] if predecessor[u] >= 0 else -1
+        if u >= 0 and mark[u] == v:
+            # walked into the current trail again
+            cycle = []
+            node = u
+            while True:
+                cycle.append(predecessor[node])
+                node = sources[cycle[-1]]
+                if node == u:
+                    break
+            cycle.reverse()
+            return cycle
 
-    # cleanup
-    for node in graph.nodes():
-        del node.dist
-        del node.predecessor
+    return None
+
+
+def _spfa_csr(graph, cost, starts, flow = None):
+    """
+    Runs the queue based bellman ford algorithm from the given node numbers
+    of a CSRGraph. Only the forward arcs are used, or the arcs with remaining
+    capacity if a flow is given.
+
+    Only nodes whose distance changed are put into the FIFO queue again, so
+    the algorithm stops as soon as nothing changes. Every n relaxations the
+    predecessor graph is checked for a cycle, which is always a negative
+    cost cycle.
+
+    Returns the distance (None if unreachable) and predecessor arc (-1 if none)
+    of every node as well as the arcs of a negative cost cycle or None.
+    """
+    offsets, targets, arc_edge, capacity = graph.offsets, graph.targets, graph.arc_edge, graph.capacity
+    n = graph.node_count()
+    dist = [None] * n
+    predecessor = [-1] * n
+    queued = [False] * n
+    for v in starts:
+        dist[v] = 0
+        queued[v] = True
+    queue = deque(starts)
 
-    return res
+    relaxations = 0
+    while queue:
+        u = queue.popleft()
+        queued[u] = False
+        du = dist[u]
+        for a in range(offsets[u], offsets[u + 1]):
+            if arc_edge[a] < 0 if flow is None else flow[a] >= capacity[a]:
+                continue
+            v = targets[a]
+            d = du + cost[a]
+            if dist[v] is None or d < dist[v]:
+                dist[v] = d
+                predecessor[v] = a
+                relaxations += 1
+                if relaxations >= n:
+                    relaxations = 0
+                    cycle = _predecessor_cycle(graph, predecessor)
+                    if cycle is not None:
+                        return dist, predecessor, cycle
+                if not queued[v]:
+                    queued[v] = True
+                    queue.append(v)
+
+    return dist, predecessor, None
+
+
+def _negative_cycle_csr(graph, cost, flow = None):
+    """
+    Searches a negative cost cycle anywhere in a CSRGraph (or its residual
+    graph if a flow is given) by starting from all nodes at once.
+
+    Returns the list of arcs making up a negative cost cycle or None.
+    """
+    return _spfa_csr(graph, cost, list(range(graph.node_count())), flow)[2]
+
+
+def _negative_cycle_numpy(graph, cost):
+    """
+    Searches a negative cost cycle anywhere in a CSRGraph like _negative_cycle_csr,
+    but runs rounds of the bellman ford algorithm on NumPy arrays.
+
+    Every round relaxes the forward arcs leaving the nodes whose distance changed
+    in the previous round at once, with a scatter-min over their targets. The
+    search stops as soon as a round changes no distance. The predecessor arcs are
+    checked for a cycle, which is always a negative cost cycle, every n changed
+    distances and after n rounds at the latest.
+
+    Returns the list of arcs making up a negative cost cycle or None.
+    """
+    if numpy is None:
+        raise ValueError("the numpy backend requires NumPy")
+    n = graph.node_count()
+    # the forward arcs, still grouped by source node, and where the ones of every node start
+    arcs = numpy.flatnonzero(numpy.asarray(graph.arc_edge) >= 0)
+    offsets = numpy.searchsorted(arcs, numpy.asarray(graph.offsets))
+    src = numpy.asarray(graph.sources)[arcs]
+    dst = numpy.asarray(graph.targets)[arcs]
+    weight = numpy.asarray(cost)[arcs]
+
+    dist = numpy.zeros(n, dtype=weight.dtype)
+    predecessor = numpy.full(n, -1, dtype=numpy.int64)
+    frontier = numpy.arange(n)
+    changes = 0
+    for rounds in range(1, n + 1):
+        # positions of all arcs leaving the frontier
+        first = offsets[frontier]
+        counts = offsets[frontier + 1] - first
+        ends = numpy.cumsum(counts)
+        pos = numpy.repeat(first - ends + counts, counts) + numpy.arange(ends[-1] if ends.size else 0)
+
+        targets = dst[pos]
+        candidate = dist[src[pos]] + weight[pos]
+        new = dist.copy()
+        numpy.minimum.at(new, targets, candidate)
+        changed = new < dist
+        frontier = numpy.flatnonzero(changed)
+        if frontier.size == 0:
+            return None
+
+        # remember one arc reaching every improved node with its new distance
+        best = changed[targets] & (candidate == new[targets])
+        predecessor[targets[best]] = arcs[pos[best]]
+        dist = new
+
+        changes += frontier.size
+        if changes >= n or rounds == n:
+            changes = 0
+            cycle = _predecessor_cycle_numpy(graph, predecessor)
+            if cycle is not None:
+                return cycle
+
+    return None
+
+
+def _predecessor_cycle_numpy(graph, predecessor):
+    """
+    Returns the list of arcs of a cycle in the graph formed by the given NumPy
+    array of predecessor arcs or None if there is no such cycle.
+
+    Following the predecessors n times from every node at once (by repeatedly
+    squaring the parent mapping) ends on a cycle for nodes leading into one.
+    """
+    n = graph.node_count()
+    sources = numpy.asarray(graph.sources)
+    # node n stands for "no predecessor" and is its own parent
+    parent = numpy.append(numpy.where(predecessor >= 0, sources[predecessor], n), n)
+    steps = 1
+    while steps < n:
+        parent = parent[parent]
+        steps *= 2
+    on_cycle = numpy.flatnonzero(parent[:n] < n)
+    if on_cycle.size == 0:
+        return None
+
+    start = int(parent[on_cycle[0]])
+    cycle = []
+    node = start
+    while True:
+        cycle.append(int(predecessor[node]))
+        node = graph.sources[cycle[-1]]
+        if node == start:
+            break
+    cycle.reverse()
+    return cycle
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Implementation of the capacity scaling algorithm to solve the maximum flow problem.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+from graph import *
+from edmonds_karp import _shortest_augmenting_path
+
+
+def _max_flow_capacity_scaling(graph, s, t, tracer):
+    """
+    Returns the per arc flow of a maximum flow from node number s to t.
+    """
+    capacity, reverse = graph.capacity, graph.reverse
+    flow = [0] * graph.arc_count()
+
+    # largest power of two not above the largest capacity, a last phase
+    # with delta 0 picks up what is left of non integral capacities
+    largest = max(list(capacity) + [0])
+    delta = 1
+    while 2 * delta <= largest:
+        delta *= 2
+    integral = all( c == int(c) for c in capacity )
+
+    while True:
+        while True:
+            path = _shortest_augmenting_path(graph, flow, s, t, delta)
+            if path is None:
+                break
+
+            amount = min( capacity[a] - flow[a] for a in path )
+            for a in path:
+                flow[a] += amount
+                flow[reverse[a]] -= amount
+            if tracer is not None:
+                tracer.augment(amount)
+
+        if tracer is not None:
+            tracer.phase("capacity scaling", delta)
+        if delta == 0 or (delta == 1 and integral):
+            break
+        delta //= 2
+
+    return flow
+
+
+def solve_max_flow_capacity_scaling(graph, s, t, tracer = None):
+    """
+    Solves the maximum flow problem using the capacity scaling algorithm for
+    the given graph and source/target node.
+
+    Flow is augmented along paths whose arcs all have a remaining capacity of
+    at least delta, which starts at the largest power of two not above the
+    largest capacity and is halved whenever no such path is left. Every phase
+    needs at most 2m augmentations, so the running time grows with log(U)
+    instead of the largest capacity U.
+
+    The graph can either be a Graph or a CSRGraph, in both cases the resulting
+    flow is stored in the load attribute of the edges. The optional tracer
+    (see tracing.Tracer) is informed about every augmentation and the end of
+    every phase.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze(edge_attrs=("capacity",))
+    flow = _max_flow_capacity_scaling(csr, csr.node_index(s), csr.node_index(t), tracer)
+    csr.write_back("load", flow)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Implementation of the cost scaling push-relabel algorithm to solve the min cost flow problem.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+from graph import *
+from collections import deque
+from heapq import heappush, heappop
+
+# factor by which epsilon is divided after every refine step
+ALPHA = 16
+
+
+class _CostScaling:
+    """
+    Goldberg-Tarjan cost scaling on a CSRGraph.
+
+    The costs are multiplied by n + 1 so that a 1-optimal flow is optimal. A flow
+    is epsilon-optimal if every residual arc has a reduced cost cost[a] + price[u]
+    - price[v] of at least -epsilon. Starting with epsilon as large as the largest
+    cost every refine step turns the flow into an epsilon / ALPHA-optimal one:
+    all arcs with negative reduced costs are saturated and the resulting excess
+    is pushed over arcs with negative reduced costs, nodes without such an arc
+    lower their price. Active nodes are discharged in FIFO order, the prices are
+    recomputed from the distances to the nodes with remaining demand at the
+    start of every step and every n relabels (global price update).
+    """
+
+    def __init__(self, graph, tracer = None):
+        self.graph = graph
+        self.tracer = tracer
+        self.n = graph.node_count()
+        if any( c != int(c) for c in graph.cost ):
+            raise ValueError("cost scaling requires integral costs")
+        self.cost = [int(c) * (self.n + 1) for c in graph.cost]
+        self.flow = [0] * graph.arc_count()
+        self.excess = [-d for d in graph.demand]
+        self.price = [0] * self.n
+
+    def _push(self, a, amount):
+        u, v = self.graph.sources[a], self.graph.targets[a]
+        self.flow[a] += amount
+        self.flow[self.graph.reverse[a]] -= amount
+        self.excess[u] -= amount
+        self.excess[v] += amount
+        if self.tracer is not None:
+            self.tracer.push(self.graph.node(u), self.graph.node(v), amount)
+
+    def _relabel(self, v, eps):
+        """
+        Lowers the price of v just enough to make one of its residual arcs admissible.
+        """
+        offsets, targets, capacity, cost, flow, price = (self.graph.offsets, self.graph.targets,
+            self.graph.capacity, self.cost, self.flow, self.price)
+        new = None
+        for a in range(offsets[v], offsets[v + 1]):
+            if flow[a] < capacity[a] and (new is None or price[targets[a]] - cost[a] > new):
+                new = price[targets[a]] - cost[a]
+        if new is None:
+            raise ValueError("demands can not be satisfied")
+        price[v] = new - eps
+        if self.tracer is not None:
+            self.tracer.relabel(self.graph.node(v), price[v])
+
+    def _global_update(self, eps):
+        """
+        Lowers the price of every node by eps times its distance to the closest
+        node with remaining demand, where a residual arc with reduced cost rc is
+        rc // eps + 1 long. The flow stays eps-optimal and every node with excess
+        gets an admissible path to a node with demand.
+        """
+        offsets, targets, reverse, capacity = (self.graph.offsets, self.graph.targets,
+            self.graph.reverse, self.graph.capacity)
+        cost, flow, excess, price = self.cost, self.flow, self.excess, self.price
+        n = self.n
+        dist = [None] * n
+        done = [False] * n
+        heap = []
+        for v in range(n):
+            if excess[v] < 0:
+                dist[v] = 0
+                heap.append((0, v))
+
+        # backwards from the nodes with demand over the twins of the residual arcs
+        longest = 0
+        while heap:
+            d, w = heappop(heap)
+            if done[w]:
+                continue    # outdated entry
+            done[w] = True
+            longest = d
+            for b in range(offsets[w], offsets[w + 1]):
+                a = reverse[b]
+                u = targets[b]
+                if done[u] or flow[a] >= capacity[a]:
+                    continue
+                nd = d + max(0, (cost[a] + price[u] - price[w]) // eps + 1)
+                if dist[u] is None or nd < dist[u]:
+                    dist[u] = nd
+                    heappush(heap, (nd, u))
+
+        for v in range(n):
+            if done[v]:
+                price[v] -= dist[v] * eps
+            elif excess[v] > 0:
+                # the excess can't reach any node with demand anymore
+                raise ValueError("demands can not be satisfied")
+            else:
+                price[v] -= (longest + 1) * eps
+
+    def _refine(self, eps):
+        """
+        Turns the current flow into an eps-optimal one.
+        """
+        offsets, targets, sources, capacity = (self.graph.offsets, self.graph.targets,
+            self.graph.sources, self.graph.capacity)
+        cost, flow, excess, price = self.cost, self.flow, self.excess, self.price
+
+        for a in range(self.graph.arc_count()):
+            if flow[a] < capacity[a] and cost[a] + price[sources[a]] - price[targets[a]] < 0:
+                self._push(a, capacity[a] - flow[a])
+
+        self._global_update(eps)
+        relabels = 0
+        current = list(offsets[:-1])
+        active = deque(v for v in range(self.n) if excess[v] > 0)
+        while active:
+            v = active.popleft()
+            end = offsets[v + 1]
+            while excess[v] > 0:
+                a = current[v]
+                if a == end:
+                    self._relabel(v, eps)
+                    current[v] = offsets[v]
+                    relabels += 1
+                    if relabels >= self.n:
+                        self._global_update(eps)
+                        relabels = 0
+                        current = list(offsets[:-1])
+                    continue
+                w = targets[a]
+                if flow[a] < capacity[a] and cost[a] + price[v] - price[w] < 0:
+                    amount = min(excess[v], capacity[a] - flow[a])
+                    self._push(a, amount)
+                    if 0 < excess[w] <= amount:
+                        active.append(w)
+                else:
+                    current[v] = a + 1
+
+    def run(self):
+        if sum( self.excess ) != 0:
+            raise ValueError("demands can not be satisfied")
+
+        eps = max([abs(c) for c in self.cost] + [1])
+        while True:
+            eps = max(1, eps // ALPHA)
+            self._refine(eps)
+            if self.tracer is not None:
+                self.tracer.phase("cost scaling", eps)
+            if eps == 1:
+                break
+
+        return self.flow
+
+
+def _min_cost_flow_cost_scaling(graph, tracer):
+    """
+    Returns the per arc flow of a min cost flow in the given CSRGraph.
+    """
+    return _CostScaling(graph, tracer).run()
+
+
+def solve_min_cost_flow_cost_scaling(graph, tracer = None):
+    """
+    Solves the min cost flow problem using the cost scaling push-relabel
+    algorithm of Goldberg and Tarjan.
+
+    The number of refine steps grows with log(nC) instead of the largest cost C,
+    the costs must be integral. The graph can either be a Graph or a CSRGraph,
+    in both cases the resulting flow is stored in the load attribute of the
+    edges. Raises a ValueError if the demands can not be satisfied. The optional
+    tracer (see tracing.Tracer) is informed about every push, every price change
+    (as relabel) and the end of every refine step.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze(edge_attrs=("capacity", "cost"))
+    csr.write_back("load", _min_cost_flow_cost_scaling(csr, tracer))
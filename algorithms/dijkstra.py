@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Implementation of Dijkstra's algorithm and A* to calculate shortest paths with non negative weights.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+from graph import *
+from heapq import heappush, heappop
+from itertools import count
+
+
+# The priority queues use lazy deletion: a node is pushed again whenever its
+# distance improves and outdated entries are skipped when they are popped, so
+# a queue never holds more entries than there are edges. The counter breaks
+# ties between equal distances since nodes can't be compared.
+
+def _lookup(graph, n):
+    node = graph._node_lookup([n])
+    if node is None:
+        raise ValueError("No such node in this graph")
+    return node
+
+
+def _weight(edge, attr):
+    w = getattr(edge, attr)
+    if w < 0:
+        raise ValueError("negative edge weight")
+    return w
+
+
+def predecessor_path(predecessors, target):
+    """
+    Returns the path to the given node formed by the predecessor edges
+    as returned by dijkstra() or None if the node was not reached.
+    """
+    if not target in predecessors:
+        return None
+    edges = []
+    node = target
+    while predecessors[node] is not None:
+        edge = predecessors[node]
+        edges.append((edge, node))
+        node = edge.nodes()[0] if edge.nodes()[1] is node else edge.nodes()[1]
+
+    path = Path(node)
+    for edge, node in reversed(edges):
+        path.append(edge, node)
+    return path
+
+
+def dijkstra(graph, source, attr = "weight"):
+    """
+    Calculates the shortest paths from the given source node/node name with
+    respect to the given (non negative) edge attribute using Dijkstra's algorithm.
+
+    Returns two dicts, the distance of every node reachable from the source
+    and the edge over which it is reached (None for the source itself), see
+    predecessor_path() to get the path to a node.
+    """
+    source = _lookup(graph, source)
+    dist = {source: 0}
+    predecessors = {source: None}
+    done = set()
+    tie = count()
+    heap = [(0, next(tie), source)]
+    while heap:
+        d, i, u = heappop(heap)
+        if u in done:
+            continue    # outdated entry
+        done.add(u)
+        # the outgoing edges are keyed by the node at their other end
+        for v, edge in u._outgoing_edges.items():
+            nd = d + _weight(edge, attr)
+            if not v in dist or nd < dist[v]:
+                dist[v] = nd
+                predecessors[v] = edge
+                heappush(heap, (nd, next(tie), v))
+
+    return dist, predecessors
+
+
+def shortest_path(graph, s, t, attr = "weight"):
+    """
+    Finds a shortest path from s to t with respect to the given (non negative)
+    edge attribute using a bidirectional Dijkstra search, one from s along the
+    outgoing edges and one from t along the incoming edges.
+
+    Returns a path object connecting s and t or None if there is no such path.
+    """
+    s, t = _lookup(graph, s), _lookup(graph, t)
+    if s is t:
+        return Path(s)
+
+    # forward and backward search state
+    dist = ({s: 0}, {t: 0})
+    predecessors = ({s: None}, {t: None})
+    done = (set(), set())
+    tie = count()
+    heaps = ([(0, next(tie), s)], [(0, next(tie), t)])
+
+    best = None
+    meet = None
+    while heaps[0] and heaps[1]:
+        if best is not None and heaps[0][0][0] + heaps[1][0][0] >= best:
+            break       # no shorter path can be found anymore
+        # expand the search with the smaller queue
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        d, i, u = heappop(heaps[side])
+        if u in done[side]:
+            continue    # outdated entry
+        done[side].add(u)
+
+        edges = u._outgoing_edges if side == 0 else u._incoming_edges
+        this, other = dist[side], dist[1 - side]
+        for v, edge in edges.items():
+            nd = d + _weight(edge, attr)
+            if not v in this or nd < this[v]:
+                this[v] = nd
+                predecessors[side][v] = edge
+                heappush(heaps[side], (nd, next(tie), v))
+            if v in other and (best is None or nd + other[v] < best):
+                best = nd + other[v]
+                meet = (u, edge, v) if side == 0 else (v, edge, u)
+
+    if meet is None:
+        return None
+
+    u, edge, v = meet
+    path = predecessor_path(predecessors[0], u)
+    path.append(edge, v)
+    while predecessors[1][v] is not None:
+        edge = predecessors[1][v]
+        v = edge.nodes()[0] if edge.nodes()[1] is v else edge.nodes()[1]
+        path.append(edge, v)
+    return path
+
+
+def a_star(graph, s, t, heuristic, attr = "weight"):
+    """
+    Finds a shortest path from s to t with respect to the given (non negative)
+    edge attribute using the A* algorithm.
+
+    heuristic is called with a node and must return a lower bound for the
+    distance from that node to t. Nodes are expanded again if a shorter path
+    to them is found, so an admissible but inconsistent heuristic still yields
+    a shortest path.
+
+    Returns a path object connecting s and t or None if there is no such path.
+    """
+    s, t = _lookup(graph, s), _lookup(graph, t)
+    dist = {s: 0}
+    predecessors = {s: None}
+    tie = count()
+    heap = [(heuristic(s), next(tie), 0, s)]
+    while heap:
+        f, i, d, u = heappop(heap)
+        if d > dist[u]:
+            continue    # outdated entry
+        if u is t:
+            return predecessor_path(predecessors, t)
+        for v, edge in u._outgoing_edges.items():
+            nd = d + _weight(edge, attr)
+            if not v in dist or nd < dist[v]:
+                dist[v] = nd
+                predecessors[v] = edge
+                heappush(heap, (nd + heuristic(v), next(tie), nd, v))
+
+    return None
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Implementation of Dinic's algorithm to solve the maximum flow problem.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+from graph import *
+from collections import deque
+
+
+def _levels(graph, flow, s, t):
+    """
+    Returns the distance of every node from s in the residual graph,
+    -1 for unreachable nodes.
+    """
+    offsets, targets, capacity = graph.offsets, graph.targets, graph.capacity
+    level = [-1] * graph.node_count()
+    level[s] = 0
+    queue = deque([s])
+    while queue:
+        u = queue.popleft()
+        if u == t:
+            break       # nodes further away than t are not needed
+        for a in range(offsets[u], offsets[u + 1]):
+            v = targets[a]
+            if level[v] < 0 and flow[a] < capacity[a]:
+                level[v] = level[u] + 1
+                queue.append(v)
+
+    return level
+
+
+def _blocking_flow(graph, flow, level, s, t, tracer):
+    """
+    Augments along paths of the level graph until s and t are disconnected in it.
+    """
+    offsets, targets, sources, reverse, capacity = (graph.offsets, graph.targets,
+        graph.sources, graph.reverse, graph.capacity)
+    current = list(offsets[:-1])
+    path = []
+    u = s
+    while True:
+        if u == t:
+            amount = min( capacity[a] - flow[a] for a in path )
+            for a in path:
+                flow[a] += amount
+                flow[reverse[a]] -= amount
+            if tracer is not None:
+                tracer.augment(amount)
+            # retreat to the tail of the first saturated arc
+            for i, a in enumerate(path):
+                if capacity[a] - flow[a] <= 0:
+                    break
+            del path[i:]
+            u = sources[a]
+            continue
+
+        # advance along the current arc of u
+        end = offsets[u + 1]
+        a = current[u]
+        while a < end and (capacity[a] - flow[a] <= 0 or level[targets[a]] != level[u] + 1):
+            a += 1
+        current[u] = a
+        if a < end:
+            path.append(a)
+            u = targets[a]
+        elif u == s:
+            break
+        else:
+            # dead end, remove u from the level graph and retreat
+            level[u] = -1
+            a = path.pop()
+            u = sources[a]
+            current[u] += 1
+
+
+def _max_flow_dinic(graph, s, t, tracer, flow = None):
+    """
+    Returns the per arc flow of a maximum flow from node number s to t,
+    starting from the given (valid) flow if any.
+    """
+    if flow is None:
+        flow = [0] * graph.arc_count()
+    while True:
+        level = _levels(graph, flow, s, t)
+        if level[t] < 0:
+            break
+        _blocking_flow(graph, flow, level, s, t, tracer)
+        if tracer is not None:
+            tracer.phase("blocking flow", level[t])
+
+    return flow
+
+
+def solve_max_flow_dinic(graph, s, t, tracer = None):
+    """
+    Solves the maximum flow problem using Dinic's algorithm for the
+    given graph and source/target node.
+
+    The graph can either be a Graph or a CSRGraph, in both cases the resulting
+    flow is stored in the load attribute of the edges. The optional tracer
+    (see tracing.Tracer) is informed about every augmentation and phase.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze(edge_attrs=("capacity",))
+    flow = _max_flow_dinic(csr, csr.node_index(s), csr.node_index(t), tracer)
+    csr.write_back("load", flow)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Implementation of the Edmonds-Karp algorithm to solve the maximum flow problem.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+from graph import *
+from collections import deque
+
+
+def _shortest_augmenting_path(graph, flow, s, t, delta = 0):
+    """
+    Returns the arcs of a shortest path from s to t in the residual
+    graph or None if t is not reachable. Only arcs with a remaining
+    capacity of at least delta (and above 0) are used.
+    """
+    offsets, targets, capacity = graph.offsets, graph.targets, graph.capacity
+    pred = [-1] * graph.node_count()
+    pred[s] = -2
+    queue = deque([s])
+    while queue:
+        u = queue.popleft()
+        for a in range(offsets[u], offsets[u + 1]):
+            v = targets[a]
+            residual = capacity[a] - flow[a]
+            if pred[v] == -1 and residual > 0 and residual >= delta:
+                pred[v] = a
+                if v == t:
+                    path = []
+                    while v != s:
+                        path.append(pred[v])
+                        v = graph.sources[pred[v]]
+                    path.reverse()
+                    return path
+                queue.append(v)
+
+    return None
+
+
+def _max_flow_ek(graph, s, t, tracer):
+    """
+    Returns the per arc flow of a maximum flow from node number s to t.
+    """
+    capacity, reverse = graph.capacity, graph.reverse
+    flow = [0] * graph.arc_count()
+    while True:
+        path = _shortest_augmenting_path(graph, flow, s, t)
+        if path is None:
+            break
+
+        amount = min( capacity[a] - flow[a] for a in path )
+        for a in path:
+            flow[a] += amount
+            flow[reverse[a]] -= amount
+        if tracer is not None:
+            tracer.augment(amount)
+
+    return flow
+
+
+def solve_max_flow_ek(graph, s, t, tracer = None):
+    """
+    Solves the maximum flow problem using the Edmonds-Karp algorithm, i.e. by
+    always augmenting along a shortest path, for the given graph and source/target node.
+
+    The graph can either be a Graph or a CSRGraph, in both cases the resulting
+    flow is stored in the load attribute of the edges. The optional tracer
+    (see tracing.Tracer) is informed about every augmentation.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze(edge_attrs=("capacity",))
+    flow = _max_flow_ek(csr, csr.node_index(s), csr.node_index(t), tracer)
+    csr.write_back("load", flow)
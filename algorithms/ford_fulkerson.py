@@ -7,41 +7,72 @@
 #
 
 from graph import *
-from basics import depth_first_search
 
 
-def solve_max_flow_ff(graph, s, t):
+def _augmenting_path(graph, flow, s, t):
     """
-    Solves the maximum flow prolem using the ford-fulkerson algorithm for the given 
+    Depth first search for a path from s to t in the residual graph.
+
+    Returns the list of arcs on the path or None if there is no such path.
+    """
+    offsets, targets, capacity = graph.offsets, graph.targets, graph.capacity
+    visited = [False] * graph.node_count()
+    visited[s] = True
+    # arcs taken so far, the nodes on the path and the next arc to look at for each of them
+    path = []
+    nodes = [s]
+    stack = [offsets[s]]
+    while stack:
+        cur = nodes[-1]
+        a = stack[-1]
+        if a == offsets[cur + 1]:
+            # done with this node
+            nodes.pop()
+            stack.pop()
+            if path:
+                path.pop()
+            continue
+        stack[-1] = a + 1
+        n = targets[a]
+        if visited[n] or flow[a] >= capacity[a]:
+            continue
+        visited[n] = True
+        path.append(a)
+        if n == t:
+            return path
+        nodes.append(n)
+        stack.append(offsets[n])
+
+    return None
+
+
+def solve_max_flow_ff(graph, s, t, tracer = None):
+    """
+    Solves the maximum flow prolem using the ford-fulkerson algorithm for the given
     graph and source/target node.
+
+    The graph can either be a Graph or a CSRGraph, in both cases the resulting
+    flow is stored in the load attribute of the edges, the capacities are not
+    modified. The optional tracer (see tracing.Tracer) is informed about every
+    augmentation.
     """
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze(edge_attrs=("capacity",))
+    s, t = csr.node_index(s), csr.node_index(t)
+    capacity, reverse = csr.capacity, csr.reverse
+    flow = [0] * csr.arc_count()
 
     while True:
-        path = depth_first_search(graph, s, t)
+        path = _augmenting_path(csr, flow, s, t)
         if path is None:
             break
 
         # find maximum capacity on the current path
-        min_capacity = None
-        for edge in path.edges():
-            if min_capacity is None or edge.capacity < min_capacity:
-                min_capacity = edge.capacity
-
-        # subtract min_capacity from all edges and add return edge
-        for edge in path.edges():
-            edge.capacity -= min_capacity
-            if not graph.has_reverse_edge(edge):
-                graph.add_edge(edge.destination(), edge.source(), {"capacity" : min_capacity, "tmp" : True})
-            else: 
-                graph.get_reverse_edge(edge).capacity += min_capacity
-            if edge.capacity == 0:
-                graph.remove_edge(edge)
-
-    # reverse edges and cleanup
-    for edge in graph.edges():
-        if hasattr(edge, "tmp"):
-            if graph.has_reverse_edge(edge):
-                graph.get_reverse_edge(edge).load = edge.capacity
-            else:
-                graph.add_edge(edge.destination(), edge.source(), {"load" : edge.capacity})
-            graph.remove_edge(edge)
+        min_capacity = min( capacity[a] - flow[a] for a in path )
+        if tracer is not None:
+            tracer.augment(min_capacity)
+
+        for a in path:
+            flow[a] += min_capacity
+            flow[reverse[a]] -= min_capacity
+
+    csr.write_back("load", flow)
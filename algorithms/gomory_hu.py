@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Implementation of Gusfield's algorithm to build Gomory-Hu trees.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+from graph import *
+from max_flow import _max_flow
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+
+class GomoryHuTree:
+    """
+    Gomory-Hu tree of an undirected graph.
+
+    The minimum cut between two nodes of the graph is the lightest edge on the
+    path between them in the tree, removing that edge splits the tree into the
+    two sides of the cut. Every node number except the root (0) is connected to
+    parent[v] by a tree edge of the given weight.
+    """
+
+    def __init__(self, nodes, parent, weight):
+        self._nodes = nodes
+        self._index = dict((node.name(), i) for i, node in enumerate(nodes))
+        self.parent = parent
+        self.weight = weight
+
+        self.depth = [0] * len(nodes)
+        self.children = [[] for node in nodes]
+        for v in range(1, len(nodes)):
+            self.children[parent[v]].append(v)
+        queue = deque([0])
+        while queue:
+            u = queue.popleft()
+            for v in self.children[u]:
+                self.depth[v] = self.depth[u] + 1
+                queue.append(v)
+
+    def _node_index(self, n):
+        if isinstance(n, Node):
+            n = n.name()
+        if not n in self._index:
+            raise ValueError("No such node in this graph")
+        return self._index[n]
+
+    def _lightest_edge(self, u, v):
+        """
+        Returns the node below the lightest tree edge between the given node numbers.
+        """
+        parent, weight, depth = self.parent, self.weight, self.depth
+        best = -1
+        while u != v:
+            if depth[u] < depth[v]:
+                u, v = v, u
+            if best < 0 or weight[u] < weight[best]:
+                best = u
+            u = parent[u]
+        return best
+
+    def edges(self):
+        """
+        Returns the edges of the tree as (node, parent, weight) tuples.
+        """
+        return [(self._nodes[v], self._nodes[self.parent[v]], self.weight[v])
+                for v in range(1, len(self._nodes))]
+
+    def min_cut_value(self, u, v):
+        """
+        Returns the weight of a minimum cut between the given nodes/node names.
+        """
+        u, v = self._node_index(u), self._node_index(v)
+        if u == v:
+            raise ValueError("nodes must be different")
+        return self.weight[self._lightest_edge(u, v)]
+
+    def min_cut(self, u, v):
+        """
+        Returns the weight of a minimum cut between the given nodes/node names
+        and the list of nodes on the side of u.
+        """
+        u, v = self._node_index(u), self._node_index(v)
+        if u == v:
+            raise ValueError("nodes must be different")
+        x = self._lightest_edge(u, v)
+
+        below = [False] * len(self._nodes)
+        below[x] = True
+        stack = [x]
+        while stack:
+            for c in self.children[stack.pop()]:
+                below[c] = True
+                stack.append(c)
+
+        return self.weight[x], [self._nodes[i] for i in range(len(self._nodes)) if below[i] == below[u]]
+
+
+def _source_side(graph, flow, s):
+    """
+    Returns the node numbers reachable from s in the residual graph of the given flow.
+    """
+    offsets, targets, capacity = graph.offsets, graph.targets, graph.capacity
+    seen = [False] * graph.node_count()
+    seen[s] = True
+    queue = deque([s])
+    while queue:
+        u = queue.popleft()
+        for a in range(offsets[u], offsets[u + 1]):
+            v = targets[a]
+            if not seen[v] and flow[a] < capacity[a]:
+                seen[v] = True
+                queue.append(v)
+    return [v for v in range(len(seen)) if seen[v]]
+
+
+def _cut(graph, s, t, method):
+    """
+    Returns the weight of a minimum s-t cut and the node numbers on the side of s.
+    """
+    flow = _max_flow(graph, s, t, None, method)
+    offsets = graph.offsets
+    value = sum( flow[a] for a in range(offsets[s], offsets[s + 1]) )
+    return value, _source_side(graph, flow, s)
+
+
+# graph shared with the worker processes
+_shared = None
+
+def _init_worker(n, arrays, method):
+    global _shared
+    columns = [memoryview(array(typecode, data)).toreadonly() for typecode, data in arrays]
+    offsets, targets, sources, reverse, capacity = columns
+    nodes = [Node(i) for i in range(n)]
+    _shared = (CSRGraph(nodes, [], offsets, targets, sources, reverse, None, None,
+                        {"capacity": capacity}, {}), method)
+
+def _pair_cut(pair):
+    graph, method = _shared
+    return _cut(graph, pair[0], pair[1], method)
+
+
+def build_gomory_hu_tree(graph, method = "push_relabel", workers = None):
+    """
+    Builds the Gomory-Hu tree of the given undirected graph with the capacity
+    edge attribute using Gusfield's algorithm, i.e. with node count - 1 max
+    flow computations by the given max flow engine (see max_flow.solve_max_flow).
+
+    The flows run on a pool of worker processes (all cpus if workers is None,
+    none if workers is 0) which receive the graph once as compact arrays. Every
+    step of the algorithm depends on the tree built so far, so the cuts are
+    computed speculatively in batches with the current tree and recomputed if
+    an earlier step changed the node pair, the resulting tree is the same as
+    without workers. The graph itself is not modified.
+
+    Returns a GomoryHuTree.
+    """
+    if not graph.is_undirected():
+        raise ValueError("graph must be undirected")
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze(edge_attrs=("capacity",))
+    n = csr.node_count()
+    if n < 2:
+        raise ValueError("graph must contain at least two nodes")
+
+    if workers == 0:
+        pool = None
+        batch = 1
+        cut = lambda pair: _cut(csr, pair[0], pair[1], method)
+    else:
+        workers = workers or os.cpu_count() or 1
+        arrays = [(c.format, c.tobytes()) for c in
+                  (csr.offsets, csr.targets, csr.sources, csr.reverse, csr.capacity)]
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(n, arrays, method))
+        batch = 2 * workers
+
+    parent = [0] * n
+    weight = [0] * n
+    cuts = {}   # s -> (t, value, side) computed for the pair (s, t)
+    try:
+        s = 1
+        while s < n:
+            pairs = [(v, parent[v]) for v in range(s, min(s + batch, n))
+                     if not v in cuts or cuts[v][0] != parent[v]]
+            results = map(cut, pairs) if pool is None else pool.map(_pair_cut, pairs)
+            for (v, t), (value, side) in zip(pairs, results):
+                cuts[v] = (t, value, side)
+
+            # apply the steps whose cuts are still valid
+            while s < n and s in cuts and cuts[s][0] == parent[s]:
+                t, value, side = cuts.pop(s)
+                weight[s] = value
+                inside = [False] * n
+                for v in side:
+                    inside[v] = True
+                for v in range(n):
+                    if v != s and inside[v] and parent[v] == t:
+                        parent[v] = s
+                if inside[parent[t]]:
+                    parent[s] = parent[t]
+                    parent[t] = s
+                    weight[s] = weight[t]
+                    weight[t] = value
+                s += 1
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return GomoryHuTree(csr.nodes(), parent, weight)
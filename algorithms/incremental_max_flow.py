@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Maximum flow which is repaired instead of recomputed after capacity changes.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+from graph import *
+from max_flow import _max_flow
+from dinic import _max_flow_dinic
+from edmonds_karp import _shortest_augmenting_path
+
+
+class _CapacityView:
+    """
+    A CSRGraph with its own, modifiable capacities.
+    """
+
+    def __init__(self, graph, capacity):
+        self.offsets = graph.offsets
+        self.targets = graph.targets
+        self.sources = graph.sources
+        self.reverse = graph.reverse
+        self.capacity = capacity
+        self._n = graph.node_count()
+
+    def node_count(self):
+        return self._n
+
+    def arc_count(self):
+        return len(self.capacity)
+
+
+class IncrementalMaxFlow:
+    """
+    Maximum flow from s to t in a graph whose capacities change over time.
+
+    The flow is solved once with the given max flow engine (see
+    max_flow.solve_max_flow) and then kept together with its own copy of the
+    capacities. After a capacity decrease the surplus flow is first rerouted
+    around the edge, whatever can't be rerouted is drained back to the source
+    and the target, afterwards (and after increases) the flow is augmented
+    from its current state. Only the parts of the graph affected by a change
+    are touched and the result is a maximum flow again, i.e. it has the same
+    value a cold solve would find (the loads of a maximum flow are not unique).
+
+    The loads are written to the load attribute of the edges after every change.
+    """
+
+    def __init__(self, graph, s, t, method = "push_relabel"):
+        self.graph = graph
+        self._freeze()
+        self.s, self.t = self.csr.node_index(s), self.csr.node_index(t)
+        self.flow = _max_flow(self.residual, self.s, self.t, None, method)
+        self.csr.write_back("load", self.flow)
+
+    def _freeze(self):
+        graph = self.graph
+        self.csr = graph if isinstance(graph, CSRGraph) else graph.freeze(edge_attrs=("capacity",))
+        self.residual = _CapacityView(self.csr, list(self.csr.capacity))
+        self._edge_index = dict((edge, e) for e, edge in enumerate(self.csr.edges()))
+
+    def value(self):
+        """
+        Returns the value of the current flow.
+        """
+        offsets, flow = self.csr.offsets, self.flow
+        return sum( flow[a] for a in range(offsets[self.s], offsets[self.s + 1]) )
+
+    def _route(self, u, v, limit):
+        """
+        Sends up to limit units of flow from u to v along residual paths.
+
+        Returns the amount sent.
+        """
+        residual, flow, reverse = self.residual, self.flow, self.residual.reverse
+        sent = 0
+        while sent < limit:
+            path = _shortest_augmenting_path(residual, flow, u, v)
+            if path is None:
+                break
+            amount = min([limit - sent] + [residual.capacity[a] - flow[a] for a in path])
+            for a in path:
+                flow[a] += amount
+                flow[reverse[a]] -= amount
+            sent += amount
+        return sent
+
+    def _decrease(self, a, amount):
+        """
+        Removes the given amount of flow from arc a and restores a valid flow.
+        """
+        flow, reverse = self.flow, self.residual.reverse
+        u, v = self.residual.sources[a], self.residual.targets[a]
+        flow[a] -= amount
+        flow[reverse[a]] += amount
+
+        # u now has the amount as excess, v is missing it: reroute it
+        # around the arc if possible, else return it to the source
+        # and take it back from the target
+        rest = amount - self._route(u, v, amount)
+        if rest and not u in (self.s, self.t):
+            self._route(u, self.s, rest)
+        if rest and not v in (self.s, self.t):
+            self._route(self.t, v, rest)
+
+    def update(self, changes, tracer = None):
+        """
+        Applies the given list of (edge, capacity) changes, setting a capacity of
+        0 removes an edge from the flow. The capacity attribute of the edges is
+        updated as well.
+
+        Returns the value of the repaired maximum flow. The optional tracer (see
+        tracing.Tracer) is informed about the augmentation phases.
+        """
+        capacity, reverse, arc_edge = self.residual.capacity, self.residual.reverse, self.csr.arc_edge
+        for edge, value in changes:
+            if not edge in self._edge_index:
+                raise ValueError("No such edge in this graph")
+            edge.capacity = value
+            a = self.csr.edge_arc[self._edge_index[edge]]
+            arcs = [a, reverse[a]] if arc_edge[reverse[a]] >= 0 else [a]
+            for x in arcs:
+                capacity[x] = value
+                if self.flow[x] > value:
+                    self._decrease(x, self.flow[x] - value)
+
+        _max_flow_dinic(self.residual, self.s, self.t, tracer, self.flow)
+        self.csr.write_back("load", self.flow)
+        return self.value()
+
+    def resync(self, tracer = None):
+        """
+        Takes edges added to or removed from the graph since the last call into
+        account (the graph must be a Graph for this). The flow on removed edges
+        is drained like after a decrease to 0, the flow on the remaining edges
+        is kept and repaired.
+
+        Returns the value of the repaired maximum flow.
+        """
+        # drain the flow off removed edges while they are still part of the snapshot
+        edges = set(self.graph.edges())
+        capacity, reverse, arc_edge = self.residual.capacity, self.residual.reverse, self.csr.arc_edge
+        for edge, e in self._edge_index.items():
+            if not edge in edges:
+                a = self.csr.edge_arc[e]
+                for x in ([a, reverse[a]] if arc_edge[reverse[a]] >= 0 else [a]):
+                    capacity[x] = 0
+                    if self.flow[x] > 0:
+                        self._decrease(x, self.flow[x])
+
+        old = dict((edge, self.flow[self.csr.edge_arc[e]]) for edge, e in self._edge_index.items())
+        s, t = self.csr.node(self.s), self.csr.node(self.t)
+        self._freeze()
+        self.s, self.t = self.csr.node_index(s), self.csr.node_index(t)
+
+        # carry the old flow over, the new edges start without capacity and
+        # are then added like a capacity increase
+        self.flow = [0] * self.csr.arc_count()
+        capacity, reverse, arc_edge = self.residual.capacity, self.residual.reverse, self.csr.arc_edge
+        new = []
+        for edge, e in self._edge_index.items():
+            a = self.csr.edge_arc[e]
+            if edge in old:
+                self.flow[a] = old[edge]
+                self.flow[reverse[a]] = -old[edge]
+            else:
+                new.append((edge, capacity[a]))
+                capacity[a] = 0
+                if arc_edge[reverse[a]] >= 0:
+                    capacity[reverse[a]] = 0
+
+        return self.update(new, tracer)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Min cost flow which is re-optimized instead of recomputed after demand, cost or capacity changes.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+from graph import *
+from incremental_max_flow import _CapacityView
+from successive_shortest_path import _saturate_negative_arcs, _successive_shortest_paths
+
+
+class _CostView(_CapacityView):
+    """
+    A CSRGraph with its own, modifiable capacities and costs.
+    """
+
+    def __init__(self, graph, capacity, cost):
+        _CapacityView.__init__(self, graph, capacity)
+        self.cost = cost
+
+
+class IncrementalMinCostFlow:
+    """
+    Min cost flow in a graph whose demands, costs and capacities change over time.
+
+    The flow is solved once with the successive shortest path algorithm (see
+    successive_shortest_path.solve_min_cost_flow_ssp), afterwards the flow, the
+    remaining excess of every node and the node potentials are kept together
+    with a copy of the demands, costs and capacities. The potentials are the
+    dual solution: every arc with remaining capacity has a non negative reduced
+    cost cost[a] + potential[u] - potential[v].
+
+    A change only disturbs this locally. Arcs whose flow exceeds their new
+    capacity are cut back and arcs whose reduced cost became negative are
+    saturated, which keeps the flow optimal but moves the supply and demand of
+    some nodes. The flow is then made feasible again by sending exactly the
+    remaining excess along shortest paths with respect to the kept potentials,
+    so small changes only cost a few Dijkstra runs instead of a full solve.
+
+    The loads are written to the load attribute of the edges after every change.
+    """
+
+    def __init__(self, graph, tracer = None):
+        self.graph = graph
+        self.csr = graph if isinstance(graph, CSRGraph) else graph.freeze(edge_attrs=("capacity", "cost"))
+        csr = self.csr
+        self.residual = _CostView(csr, list(csr.capacity), list(csr.cost))
+        self.demand = list(csr.demand)
+        self.flow = [0] * csr.arc_count()
+        self.excess = [-d for d in self.demand]
+        self.potential = [0] * csr.node_count()
+        self._edge_index = dict((edge, e) for e, edge in enumerate(csr.edges()))
+
+        _saturate_negative_arcs(self.residual, self.flow, self.excess)
+        self._reoptimize(tracer)
+
+    def costs(self):
+        """
+        Returns the total costs of the current flow.
+        """
+        flow, cost = self.flow, self.residual.cost
+        return sum( flow[a] * cost[a] for a in self.csr.edge_arc )
+
+    def _arcs(self, edge):
+        """
+        Returns the arcs of the given edge: its forward arc and the twin.
+        """
+        if not edge in self._edge_index:
+            raise ValueError("No such edge in this graph")
+        a = self.csr.edge_arc[self._edge_index[edge]]
+        return a, self.residual.reverse[a]
+
+    def _move(self, a, amount):
+        """
+        Sends the given amount of flow over arc a, changing the excess of its end points.
+        """
+        residual, flow, excess = self.residual, self.flow, self.excess
+        flow[a] += amount
+        flow[residual.reverse[a]] -= amount
+        excess[residual.sources[a]] -= amount
+        excess[residual.targets[a]] += amount
+
+    def _repair(self, a):
+        """
+        Restores the capacity constraint and the non negative reduced cost of arc a.
+        """
+        residual, flow, potential = self.residual, self.flow, self.potential
+        capacity = residual.capacity
+        if flow[a] > capacity[a]:
+            self._move(a, capacity[a] - flow[a])
+        u, v = residual.sources[a], residual.targets[a]
+        if flow[a] < capacity[a] and residual.cost[a] + potential[u] - potential[v] < 0:
+            self._move(a, capacity[a] - flow[a])
+
+    def _reoptimize(self, tracer):
+        _successive_shortest_paths(self.residual, self.flow, self.excess, self.potential, tracer)
+        if any( self.excess ):
+            raise ValueError("demands can not be satisfied")
+        self.csr.write_back("load", self.flow)
+
+    def update(self, demands = None, costs = None, capacities = None, tracer = None):
+        """
+        Applies the given lists of (node, demand), (edge, cost) and (edge, capacity)
+        changes and re-optimizes the flow. The attributes of the nodes and edges are
+        updated as well.
+
+        Returns the total costs of the new min cost flow. Raises a ValueError if the
+        demands can not be satisfied anymore, the state is kept so that a later
+        change can make the problem feasible again. The optional tracer (see
+        tracing.Tracer) is informed about every augmentation.
+        """
+        cost, capacity, arc_edge = self.residual.cost, self.residual.capacity, self.csr.arc_edge
+        nodes = self.csr.nodes()
+        arcs = []
+
+        for n, demand in demands or ():
+            v = self.csr.node_index(n)
+            nodes[v].demand = demand
+            self.excess[v] += self.demand[v] - demand
+            self.demand[v] = demand
+
+        for edge, value in costs or ():
+            a, b = self._arcs(edge)
+            edge.cost = value
+            cost[a], cost[b] = value, value if arc_edge[b] >= 0 else -value
+            arcs += [a, b]
+
+        for edge, value in capacities or ():
+            a, b = self._arcs(edge)
+            edge.capacity = value
+            capacity[a] = value
+            if arc_edge[b] >= 0:
+                capacity[b] = value
+            arcs += [a, b]
+
+        for a in arcs:
+            self._repair(a)
+
+        self._reoptimize(tracer)
+        return self.costs()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Implementation of the randomized Karger-Stein algorithm to solve the minimum cut problem.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+from graph import *
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil, log, sqrt
+import os
+import random
+
+
+def _find(group, v):
+    """
+    Returns the representative of v in the given union-find forest.
+    """
+    while group[v] != v:
+        group[v] = group[group[v]]
+        v = group[v]
+    return v
+
+
+def _contract(n, edges, labels, t, rnd):
+    """
+    Contracts randomly chosen edges, each with a probability proportional to
+    its weight, until only t nodes are left.
+
+    Returns the node count, the edges and the labels of the contracted graph.
+    """
+    # contracting in the order of exponentially distributed keys scaled by the
+    # weights is the same as repeatedly picking an edge by weight
+    keys = [rnd.expovariate(1.0) / w if w > 0 else float("inf") for u, v, w in edges]
+    group = list(range(n))
+    count = n
+    for i in sorted(range(len(edges)), key=keys.__getitem__):
+        if count <= t:
+            break
+        u, v, w = edges[i]
+        u, v = _find(group, u), _find(group, v)
+        if u != v:
+            group[v] = u
+            count -= 1
+
+    # renumber the remaining nodes and merge parallel edges
+    index = {}
+    new_labels = []
+    for v in range(n):
+        u = _find(group, v)
+        if not u in index:
+            index[u] = len(new_labels)
+            new_labels.append([])
+        new_labels[index[u]].extend(labels[v])
+        group[v] = u
+    weights = {}
+    for u, v, w in edges:
+        u, v = index[group[u]], index[group[v]]
+        if u != v:
+            key = (u, v) if u < v else (v, u)
+            weights[key] = weights.get(key, 0) + w
+
+    return len(new_labels), [(u, v, w) for (u, v), w in weights.items()], new_labels
+
+
+def _brute_force(n, edges, labels):
+    """
+    Tries every partition of a small graph.
+    """
+    best = None
+    for mask in range(1, 1 << (n - 1)):
+        cut = 0
+        for u, v, w in edges:
+            if (mask >> u & 1) != (mask >> v & 1):
+                cut += w
+        if best is None or cut < best[0]:
+            best = (cut, mask)
+
+    cut, mask = best
+    return cut, [x for v in range(n) if mask >> v & 1 for x in labels[v]]
+
+
+def _karger_stein(n, edges, labels, rnd):
+    if not edges:
+        return 0, labels[0]     # not connected
+    if n <= 6:
+        return _brute_force(n, edges, labels)
+
+    t = int(ceil(1 + n / sqrt(2)))
+    best = None
+    for i in range(2):
+        m, contracted, merged = _contract(n, edges, labels, t, rnd)
+        res = _karger_stein(m, contracted, merged, rnd)
+        if best is None or res[0] < best[0]:
+            best = res
+    return best
+
+
+# graph shared with the worker processes
+_shared = None
+
+def _init_worker(n, ends, weights, typecode):
+    global _shared
+    ends = array("q", ends)
+    weights = array(typecode, weights)
+    _shared = (n, [(ends[2 * i], ends[2 * i + 1], weights[i]) for i in range(len(weights))])
+
+def _trial(seed):
+    n, edges = _shared
+    return _karger_stein(n, edges, [[v] for v in range(n)], random.Random(seed))
+
+
+def solve_min_cut_karger_stein(graph, probability = 0.99, workers = None, seed = 0):
+    """
+    Calculate a minimum cut in the given undirected graph using the randomized
+    Karger-Stein algorithm.
+
+    A single run finds a minimum cut with a probability of at least about
+    1 / log(n), so enough independent runs are done to find it with the given
+    probability. The runs are spread over a pool of worker processes (all cpus
+    if workers is None, none if workers is 0), the graph is sent to them once
+    as a compact edge array. Every run is seeded from the given seed and its
+    number, so the result does not depend on the number of workers.
+
+    Returns the weight of the cut and the list of nodes on one side of it.
+    """
+    if not graph.is_undirected():
+        raise ValueError("graph must be undirected")
+    if not 0 < probability < 1:
+        raise ValueError("probability must be between 0 and 1")
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze(edge_attrs=("weight",))
+    n = csr.node_count()
+    if n < 2:
+        raise ValueError("graph must contain at least two nodes")
+
+    # compact edge array: end points and weights of all non loop edges
+    ends = array("q")
+    edges = [a for a in csr.edge_arc if csr.sources[a] != csr.targets[a]]
+    for a in edges:
+        ends.append(csr.sources[a])
+        ends.append(csr.targets[a])
+    weights = array(csr.weight.format, [csr.weight[a] for a in edges])
+
+    trials = int(ceil(max(log(n, 2), 1) * log(1 / (1 - probability))))
+    seeds = ["%s-%i" % (seed, i) for i in range(trials)]
+    initargs = (n, ends.tobytes(), weights.tobytes(), weights.typecode)
+    if workers == 0:
+        _init_worker(*initargs)
+        results = map(_trial, seeds)
+    else:
+        workers = workers or os.cpu_count() or 1
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs)
+        results = pool.map(_trial, seeds, chunksize=max(trials // (4 * workers), 1))
+
+    best = None
+    try:
+        for cut, side in results:
+            if best is None or cut < best[0]:
+                best = (cut, side)
+    finally:
+        if workers != 0:
+            pool.shutdown()
+
+    cut, side = best
+    return cut, [csr.node(v) for v in sorted(side)]
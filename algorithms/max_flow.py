@@ -7,97 +7,233 @@
 #
 
 from graph import *
+from collections import deque
+from dinic import solve_max_flow_dinic, _max_flow_dinic
+from edmonds_karp import solve_max_flow_ek, _max_flow_ek
+from capacity_scaling import solve_max_flow_capacity_scaling, _max_flow_capacity_scaling
 
-def _get_active_node(graph, s, t):
-    for node in graph.nodes():
-        if not node is t and not node is s and node.overrun > 0:
-            return node
 
-    return None
-
-def _has_active_node(graph, s, t):
-    return True if not _get_active_node(graph, s, t) is None else False
-
-def _push(node):
+class _PushRelabel:
     """
-    Push load away from the current node if possible.
+    Highest-label push-relabel on a CSRGraph.
 
-    If a neighboring node which is "closer" to the target can accept more load
-    push it to the node. If no such node is found push fails meaning a relabel has
-    to be executed.
+    Active nodes are kept in buckets by label and always the one with the highest
+    label is discharged. Every node remembers its current arc, labels are
+    recomputed exactly by a breadth first search from the target (and the source
+    for nodes which can't reach the target anymore) every n relabels, and the gap
+    heuristic lifts nodes which got cut off from the target directly to n.
     """
-    success = False
-    for edge in node.outgoing_edges():
-        neighbor = edge.destination()
-        if not node.dist == neighbor.dist + 1 or edge.load == edge.capacity:
-            continue
-        success = True
-        reverse_edge = node.edge_from(neighbor)
-
-        push = min(edge.capacity - edge.load, node.overrun)
-        edge.load         += push
-        reverse_edge.load -= push
-        neighbor.overrun  += push
-        node.overrun      -= push
-
-        print("[*] pushing %i from %s to %s" % (push, node.name(), neighbor.name()))
-
-        if node.overrun == 0:
-            break
-
-    return success
 
-def _relabel(node):
+    def __init__(self, graph, s, t, tracer = None):
+        self.graph = graph
+        self.tracer = tracer
+        self.s = s
+        self.t = t
+        self.n = graph.node_count()
+        self.flow = [0] * graph.arc_count()
+        self.excess = [0] * self.n
+        self.label = [0] * self.n
+        self.current = list(graph.offsets[:-1])
+        # active nodes and number of nodes per label, labels are always < 2n
+        self.buckets = [[] for i in range(2 * self.n + 1)]
+        self.count = [0] * (2 * self.n + 1)
+        # doubly linked list of the nodes of every label below n for the gap heuristic
+        self.head = [-1] * self.n
+        self.next = [-1] * self.n
+        self.prev = [-1] * self.n
+        self.max_active = -1
+        self.relabels = 0
+
+    def _link(self, v, d):
+        head = self.head[d]
+        self.next[v] = head
+        self.prev[v] = -1
+        if head >= 0:
+            self.prev[head] = v
+        self.head[d] = v
+
+    def _unlink(self, v, d):
+        prev, next = self.prev[v], self.next[v]
+        if prev >= 0:
+            self.next[prev] = next
+        else:
+            self.head[d] = next
+        if next >= 0:
+            self.prev[next] = prev
+
+    def _activate(self, v):
+        d = self.label[v]
+        self.buckets[d].append(v)
+        if d > self.max_active:
+            self.max_active = d
+
+    def _bfs(self, root, base, label):
+        """
+        Labels every unlabeled node which can reach root in the residual graph
+        with its distance to root plus the given base.
+        """
+        offsets, targets, reverse, capacity, flow = (self.graph.offsets, self.graph.targets,
+            self.graph.reverse, self.graph.capacity, self.flow)
+        label[root] = base
+        queue = deque([root])
+        while queue:
+            w = queue.popleft()
+            d = label[w] + 1
+            for a in range(offsets[w], offsets[w + 1]):
+                u = targets[a]
+                b = reverse[a]
+                if label[u] < 0 and flow[b] < capacity[b]:
+                    label[u] = d
+                    queue.append(u)
+
+    def _global_relabel(self):
+        n = self.n
+        label = [-1] * n
+        label[self.s] = n
+        self._bfs(self.t, 0, label)
+        label[self.s] = -1
+        self._bfs(self.s, n, label)
+        for v in range(n):
+            if label[v] < 0:
+                label[v] = 2 * n    # can't reach source or target, never active
+        self.label = label
+
+        # rebuild buckets, counts and label lists
+        self.buckets = [[] for i in range(2 * n + 1)]
+        self.count = [0] * (2 * n + 1)
+        self.head = [-1] * n
+        self.max_active = -1
+        for v in range(n):
+            self.count[label[v]] += 1
+            if label[v] < n:
+                self._link(v, label[v])
+            if self.excess[v] > 0 and v != self.s and v != self.t:
+                self._activate(v)
+        self.current = list(self.graph.offsets[:-1])
+        self.relabels = 0
+        if self.tracer is not None:
+            self.tracer.phase("global relabel")
+
+    def _relabel(self, v):
+        offsets, targets, capacity, flow, label = (self.graph.offsets, self.graph.targets,
+            self.graph.capacity, self.flow, self.label)
+        n = self.n
+        old = label[v]
+        new = 2 * n
+        for a in range(offsets[v], offsets[v + 1]):
+            if flow[a] < capacity[a] and label[targets[a]] + 1 < new:
+                new = label[targets[a]] + 1
+                self.current[v] = a
+        label[v] = new
+        self.count[old] -= 1
+        self.count[new] += 1
+        if old < n:
+            self._unlink(v, old)
+        if new < n:
+            self._link(v, new)
+        self.relabels += 1
+
+        if self.count[old] == 0 and old < n:
+            # gap: nodes above the empty label can't reach the target anymore,
+            # the labels below n are contiguous so the first empty one ends them
+            for d in range(old + 1, n):
+                u = self.head[d]
+                if u < 0:
+                    break
+                while u >= 0:
+                    label[u] = n
+                    self.current[u] = offsets[u]
+                    u = self.next[u]
+                self.count[n] += self.count[d]
+                self.count[d] = 0
+                self.head[d] = -1
+
+    def _discharge(self, v):
+        offsets, targets, reverse, capacity = (self.graph.offsets, self.graph.targets,
+            self.graph.reverse, self.graph.capacity)
+        flow, excess, label = self.flow, self.excess, self.label
+        tracer = self.tracer
+        end = offsets[v + 1]
+        while excess[v] > 0:
+            a = self.current[v]
+            if a == end:
+                self._relabel(v)
+                if tracer is not None:
+                    tracer.relabel(self.graph.node(v), label[v])
+                if label[v] >= 2 * self.n:
+                    break
+                continue
+            w = targets[a]
+            if flow[a] < capacity[a] and label[v] == label[w] + 1:
+                push = min(capacity[a] - flow[a], excess[v])
+                flow[a] += push
+                flow[reverse[a]] -= push
+                if excess[w] == 0 and w != self.s and w != self.t:
+                    self._activate(w)
+                excess[w] += push
+                excess[v] -= push
+                if tracer is not None:
+                    tracer.push(self.graph.node(v), self.graph.node(w), push)
+            else:
+                self.current[v] = a + 1
+
+    def run(self):
+        offsets, targets, reverse, capacity = (self.graph.offsets, self.graph.targets,
+            self.graph.reverse, self.graph.capacity)
+        s = self.s
+
+        # saturate all arcs going out of the source node
+        for a in range(offsets[s], offsets[s + 1]):
+            if capacity[a] > 0 and targets[a] != s:
+                self.flow[a] += capacity[a]
+                self.flow[reverse[a]] -= capacity[a]
+                self.excess[targets[a]] += capacity[a]
+                self.excess[s] -= capacity[a]
+        self._global_relabel()
+
+        while self.max_active >= 0:
+            bucket = self.buckets[self.max_active]
+            if not bucket:
+                self.max_active -= 1
+                continue
+            v = bucket.pop()
+            if self.label[v] != self.max_active:
+                continue    # stale entry, the node was lifted by a gap
+            self._discharge(v)
+            if self.relabels >= self.n:
+                self._global_relabel()
+
+        return self.flow
+
+
+def _max_flow(graph, s, t, tracer = None, method = "push_relabel"):
     """
-    Relabel a node.
-
-    Adjusts the dist value of the current node to the minimun dist
-    value of its neighbors plus one.
+    Returns the per arc flow of a maximum flow from node number s to t
+    in the given CSRGraph, computed by the given engine.
     """
-    min_dist = None
-    for edge in node.outgoing_edges():
-        if edge.load == edge.capacity:
-            continue
-        if min_dist is None or edge.destination().dist < min_dist:
-            min_dist = edge.destination().dist
-
-    node.dist = min_dist + 1
-        
-
-def solve_max_flow(graph, s, t):
+    if method == "push_relabel":
+        return _PushRelabel(graph, s, t, tracer).run()
+    elif method == "dinic":
+        return _max_flow_dinic(graph, s, t, tracer)
+    elif method == "edmonds_karp":
+        return _max_flow_ek(graph, s, t, tracer)
+    elif method == "capacity_scaling":
+        return _max_flow_capacity_scaling(graph, s, t, tracer)
+    raise ValueError("unknown max flow method %s" % method)
+
+
+def solve_max_flow(graph, s, t, tracer = None, method = "push_relabel"):
     """
-    Solves the max flow prolem using the push-relabel algorithm for the given 
+    Solves the max flow prolem using the push-relabel algorithm for the given
     graph and source/target node.
+
+    The graph can either be a Graph or a CSRGraph, in both cases the resulting
+    flow is stored in the load attribute of the edges. The optional tracer
+    (see tracing.Tracer) is informed about every push and relabel.
+
+    method selects the engine: "push_relabel" (default), "dinic", "edmonds_karp"
+    or "capacity_scaling".
     """
-    #
-    # initialize algorithm specific data
-    #
-    for node in graph.nodes():
-        node.dist = 0
-        node.overrun = 0
-    for edge in graph.edges():
-        edge.load = 0
-        # add return edges
-        if not graph.has_reverse_edge(edge):
-            graph.add_edge(edge.destination(), edge.source(), {"capacity" : 0, "load" : 0, "tmp" : True})
-    # initialize source node
-    s.dist = len(graph.nodes())
-    # populate edges going out of the source node
-    for edge in s.outgoing_edges():
-        edge.load = edge.capacity
-        edge.destination().overrun = edge.load
-        edge.destination().edge_to(s).load = -edge.capacity
-
-    # 
-    # solve the max flow problem
-    #
-    while _has_active_node(graph, s, t):
-        node = _get_active_node(graph, s, t)
-        if not _push(node):
-            _relabel(node)
-            print("[*] relabeling %s to dist %i" % (node.name(), node.dist))
-
-    # cleanup
-    for edge in graph.edges():
-        if hasattr(edge, "tmp"):
-            graph.remove_edge(edge)
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze(edge_attrs=("capacity",))
+    flow = _max_flow(csr, csr.node_index(s), csr.node_index(t), tracer, method)
+    csr.write_back("load", flow)
@@ -6,38 +6,120 @@
 #
 
 from graph import *
-from max_flow import solve_max_flow
-from copy import deepcopy
-from bellman_ford import bellman_ford_cycle
+from bellman_ford import _negative_cycle_csr
+from residual import ResidualGraph
+from successive_shortest_path import solve_min_cost_flow_ssp, _min_cost_flow_ssp
+from network_simplex import solve_min_cost_flow_simplex, _min_cost_flow_simplex
+from cost_scaling import solve_min_cost_flow_cost_scaling, _min_cost_flow_cost_scaling
+from collections import deque
 
 
-def _build_residual_graph(graph):
-    res = deepcopy(graph)
+def _feasible_flow_csr(graph, flow):
+    """
+    Routes the supply of every producer to the consumers along
+    shortest augmenting paths in the residual graph.
+    """
+    offsets, targets, reverse, capacity = graph.offsets, graph.targets, graph.reverse, graph.capacity
+    n = graph.node_count()
+    excess = [-d for d in graph.demand]
+
+    while True:
+        # breadth first search from all nodes with remaining supply
+        pred = [-1] * n
+        queue = deque(v for v in range(n) if excess[v] > 0)
+        if not queue:
+            if any( excess ):
+                # demand left over which no supply can satisfy
+                raise ValueError("demands can not be satisfied")
+            break
+        seen = [False] * n
+        for v in queue:
+            seen[v] = True
+        sink = -1
+        while queue and sink < 0:
+            u = queue.popleft()
+            for a in range(offsets[u], offsets[u + 1]):
+                v = targets[a]
+                if seen[v] or flow[a] >= capacity[a]:
+                    continue
+                seen[v] = True
+                pred[v] = a
+                if excess[v] < 0:
+                    sink = v
+                    break
+                queue.append(v)
+        if sink < 0:
+            raise ValueError("demands can not be satisfied")
+
+        # determine the amount that can be sent along the path and augment
+        path = []
+        v = sink
+        while pred[v] >= 0:
+            path.append(pred[v])
+            v = graph.sources[pred[v]]
+        amount = min([excess[v], -excess[sink]] + [capacity[a] - flow[a] for a in path])
+        for a in path:
+            flow[a] += amount
+            flow[reverse[a]] -= amount
+        excess[v] -= amount
+        excess[sink] += amount
+
+
+def _cancel_cycles(residual, tracer):
+    """
+    Improves the flow of the given residual graph by cancelling negative
+    cost cycles until there are none left.
+    """
+    while True:
+        neg_cycle = _negative_cycle_csr(residual.graph, residual.graph.cost, residual.flow)
+        if neg_cycle is None:
+            break
+        max_flow = min( residual.residual_capacity(a) for a in neg_cycle )
+        if tracer is not None:
+            tracer.augment(max_flow)
+        residual.augment(neg_cycle, max_flow)
+
+
+def _min_cost_flow_cycle_cancelling(graph, tracer):
+    """
+    Cycle cancelling on a CSRGraph, returns the per arc flow.
+    """
+    residual = ResidualGraph(graph)
 
-    for edge in res.edges():
-        if edge.load > 0:
-            if res.has_reverse_edge(edge):
-                raise ValueError("reverse edge found, something is wrong")
-            else:
-                print("[*] adding reverse edge %s --> %s" % (edge.destination().name(), edge.source().name()))
-                res.add_edge(edge.destination(), edge.source(), {"capacity" : edge.load,
-                                                                 "load" : 0,
-                                                                 "cost" : -edge.cost})
-            edge.capacity -= edge.load
-        if edge.capacity == 0:
-            print("[*] removing edge %s --> %s" % (edge.source().name(), edge.destination().name()))
-            res.remove_edge(edge)
+    # first calculate a valid flow
+    _feasible_flow_csr(graph, residual.flow)
+    if tracer is not None:
+        tracer.phase("max flow", "total load: %i total costs: %i" % _flow_stats(graph, residual.flow))
 
-    return res
+    _cancel_cycles(residual, tracer)
+    if tracer is not None:
+        tracer.phase("cycle cancelling", "total load: %i total costs: %i" % _flow_stats(graph, residual.flow))
+    return residual.flow
 
 
-def _stats(g):
+def _min_cost_flow(graph, tracer = None, method = "cycle_cancelling"):
+    """
+    Returns the per arc flow of a min cost flow in the given CSRGraph,
+    computed by the given engine.
+    """
+    if method == "cycle_cancelling":
+        return _min_cost_flow_cycle_cancelling(graph, tracer)
+    elif method == "ssp":
+        return _min_cost_flow_ssp(graph, tracer)
+    elif method == "simplex":
+        return _min_cost_flow_simplex(graph, tracer)
+    elif method == "cost_scaling":
+        return _min_cost_flow_cost_scaling(graph, tracer)
+    raise ValueError("unknown min cost flow method %s" % method)
+
+
+def _flow_stats(graph, flow):
     costs = 0
     load = 0
-    for edge in g.edges():
-        costs += edge.load * edge.cost
-        load += edge.load
-   
+    for a in graph.edge_arc:
+        costs += flow[a] * graph.cost[a]
+        load += flow[a]
+
     return (load, costs)
 
 
@@ -61,60 +143,20 @@ def is_valid_flow(graph):
     return True
 
 
-def solve_min_cost_flow(graph):
+def solve_min_cost_flow(graph, tracer = None, method = "cycle_cancelling"):
     """
     Solves the min cost flow problem using the cycle cancelling algorithm.
-    """
-    #
-    # initialize algorithm specific data
-    #
-    # add two temporary nodes: global source and global target
-    gs, gt = graph.add_nodes(["GS", "GT"])
 
-    # connect producers to global source and consumers to global target
-    for node in graph.nodes():
-        if not node is gs and not node is gt:
-            if node.demand < 0:
-                graph.add_edge(gs, node, {"capacity" : -node.demand})
-            elif node.demand > 0:
-                graph.add_edge(node, gt, {"capacity" : node.demand})
-
-    # 
-    # solve the min cost flow problem
-    #
-    # first calculate a valid path by solving the max-flow problem
-    solve_max_flow(graph, gs, gt)
-
-    # remove temporary nodes
-    graph.remove_nodes(["GS", "GT"])
-    print("[*] done calculating the maximum flow")
-    print("[*] total load: %i total costs: %i" % _stats(graph))
-
-    #
-    # improve the flow:
-    # build the residual graph and determine negative cost cycles
-    repeat = True
-    while repeat:
-        res_graph = _build_residual_graph(graph)
-        repeat = False
-
-        neg_cycle = bellman_ford_cycle(res_graph)
-        if neg_cycle:
-            print("[*] negative cost cycle found, adapting flow...")
-            max_flow = None
-            for edge in neg_cycle.edges():
-                if max_flow is None or edge.capacity < max_flow:
-                    max_flow = edge.capacity
-
-            repeat = True
-            for edge in neg_cycle.edges():
-                # need to use names here as we are working on a deep copy of the original graph
-                n_edge = graph.get_edge(edge.source().name(), edge.destination().name())
-                if n_edge is None:
-                    graph.get_edge(edge.destination().name(), edge.source().name()).load -= max_flow
-                else:
-                    n_edge.load += max_flow
-
-                      
-    print("[*] no (more) negative cost cycles, done.")
-    print("[*] total load: %i total costs: %i" % _stats(graph))
+    The graph can either be a Graph or a CSRGraph, in both cases the resulting
+    flow is stored in the load attribute of the edges and the graph is not
+    modified otherwise. Raises a ValueError if the demands can not be satisfied.
+    The optional tracer (see tracing.Tracer) is informed about the initial
+    feasible flow and every cancelled cycle.
+
+    method selects the engine: "cycle_cancelling" (default), "ssp" for
+    successive shortest paths, "simplex" for the network simplex algorithm or
+    "cost_scaling" for the cost scaling push-relabel algorithm (integral costs
+    only).
+    """
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze(edge_attrs=("capacity", "cost"))
+    csr.write_back("load", _min_cost_flow(csr, tracer, method))
@@ -6,75 +6,99 @@
 # Copyright (c) 2013 Samuel Groß
 #
 
-import sys
 from graph import *
-from copy import deepcopy
+from heapq import heappush, heappop
 
-def merge(graph, node1, node2):
+
+def _find(group, v):
     """
-    Merges the two given nodes into one node and returns a copy of
-    the old graph with the two nodes merged together.
+    Returns the representative of v in the given union-find forest.
     """
-    new = deepcopy(graph)
-    merged = new.add_node(node1.name() + node2.name())
-
-    for edge in node1.outgoing_edges() + node2.outgoing_edges():
-        other = edge.node1() if not edge.node1() == node1 and not edge.node1() == node2 else edge.node2()
-        if not new.has_edge(merged, other.name()):
-            new.add_undirected_edge(merged, other.name(), {"weight" : edge.weight})
-        else:
-            new.get_edge(merged, other.name()).weight += edge.weight
-
-    new.remove_nodes([node1.name(), node2.name()])
+    while group[v] != v:
+        group[v] = group[group[v]]
+        v = group[v]
+    return v
 
-    return new
 
-def get_strongly_connected_node(graph, nodeset):
+def _phase(adj, alive):
     """
-    Returns the node connected to the given node set the strongest.
+    Runs one phase: grows a node set starting with the first alive node by
+    always adding the node connected to the set the strongest.
 
-    Returns None if there are no more nodes left.
+    Returns the last two nodes added and the weight of the cut of the phase.
     """
-    max_weight = 0
-    res = None
-    for node in graph.nodes():
-        if node not in nodeset:
-            cur_weight = 0
-            for other in nodeset:
-                if other.has_edge_to(node):
-                    cur_weight += other.edge_to(node).weight
-            if cur_weight > max_weight:
-                max_weight = cur_weight
-                res = node
-
-    return res
-
-def solve_min_cut(graph):
+    key = dict((v, 0) for v in alive)
+    heap = [(0, v) for v in alive]
+    prev = last = None
+    cut = 0
+    while key:
+        k, node = heappop(heap)
+        if not node in key or -k != key[node]:
+            continue    # outdated entry
+        cut = key.pop(node)
+        prev, last = last, node
+        for v, w in adj[node].items():
+            if v in key:
+                key[v] += w
+                heappush(heap, (-key[v], v))
+
+    return prev, last, cut
+
+
+def solve_min_cut(graph, tracer = None):
     """
     Calculate a minimum cut in the given graph.
+
+    Returns the weight of the cut and the list of nodes on one side of it.
+    The optional tracer (see tracing.Tracer) is informed about the result
+    of every phase.
     """
     if not graph.is_undirected():
         raise ValueError("graph must be undirected")
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze(edge_attrs=("weight",))
+    sources, targets, weight = csr.sources, csr.targets, csr.weight
+    n = csr.node_count()
+    if n < 2:
+        raise ValueError("graph must contain at least two nodes")
+
+    # adjacency of the contracted graph: node -> {neighbor: weight}
+    adj = [{} for i in range(n)]
+    for a in range(csr.arc_count()):
+        u, v = sources[a], targets[a]
+        if u != v:
+            adj[u][v] = adj[u].get(v, 0) + weight[a]
+    alive = list(range(n))
 
-    min_cut = sys.maxsize
+    min_cut = None
+    merges = []
+    best = None
     phase = 1
-    while True:
-        nodeset = [graph.nodes()[0]]
-        while len(nodeset) < len(graph.nodes()) - 1:
-            nodeset.append(get_strongly_connected_node(graph, nodeset))
-
-        last_node = get_strongly_connected_node(graph, nodeset)
-        cut = 0
-        for edge in last_node.outgoing_edges():
-            cut += edge.weight
-
-        graph = merge(graph, nodeset[-1], last_node)
-        print("[*] result from phase %i: %i" % (phase, cut))
-        phase += 1
-        if cut < min_cut:
+    while len(alive) > 1:
+        prev, last, cut = _phase(adj, alive)
+        if min_cut is None or cut < min_cut:
+            # the nodes merged into last so far are one side of the cut
             min_cut = cut
+            best = (len(merges), last)
+
+        # merge the last node into the one added before it
+        for v, w in adj[last].items():
+            del adj[v][last]
+            if v != prev:
+                adj[prev][v] = adj[prev].get(v, 0) + w
+                adj[v][prev] = adj[v].get(prev, 0) + w
+        adj[last] = {}
+        alive.remove(last)
+        merges.append((prev, last))
+
+        if tracer is not None:
+            tracer.phase("min cut phase %i" % phase, cut)
+        phase += 1
 
-        if len(graph.nodes()) == 1:
-            break
+    # replay the merges done before the best phase to get its partition
+    count, last = best
+    group = list(range(n))
+    for prev, merged in merges[:count]:
+        group[_find(group, merged)] = _find(group, prev)
+    side = [csr.node(v) for v in range(n) if _find(group, v) == _find(group, last)]
 
-    print("[*] minimun cut found: %i" % min_cut)
+    return min_cut, side
@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Implementation of the primal network simplex algorithm to solve the min cost flow problem.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+from graph import *
+from math import sqrt
+
+
+class _NetworkSimplex:
+    """
+    Primal network simplex on a CSRGraph.
+
+    Every node is connected to an artificial root by an artificial arc with
+    very high costs, those arcs form the initial (strongly feasible) spanning
+    tree. The tree is stored in parent, pred (arc to the parent), depth and
+    thread (preorder successor) arrays, the subtree of a node are the nodes
+    following it on the thread which are deeper in the tree. Entering arcs are
+    chosen by block search: the arcs are scanned in blocks of about sqrt(m)
+    and the most violating arc of the first block containing one is used.
+    """
+
+    def __init__(self, graph):
+        if not graph.is_directed():
+            raise ValueError("graph must be directed")
+        n = graph.node_count()
+        self.n = n
+        root = self.root = n
+
+        # real arcs followed by one artificial arc per node
+        self.src = []
+        self.dst = []
+        self.cap = []
+        self.cost = []
+        for a in graph.edge_arc:
+            self.src.append(graph.sources[a])
+            self.dst.append(graph.targets[a])
+            self.cap.append(graph.capacity[a])
+            self.cost.append(graph.cost[a])
+        self.m = len(self.src)
+        self.flow = [0] * self.m
+        self.state = [1] * self.m      # 1: at lower bound, -1: at upper bound, 0: in tree
+
+        big = 1 + n * max([abs(c) for c in self.cost] + [1])
+        self.parent = [root] * (n + 1)
+        self.pred = [0] * (n + 1)
+        self.depth = [1] * (n + 1)
+        self.thread = list(range(1, n + 2))
+        self.rev_thread = list(range(-1, n))
+        self.potential = [0] * (n + 1)
+        for v in range(n):
+            supply = -graph.demand[v]
+            self.pred[v] = len(self.src)
+            if supply >= 0:
+                self._add_artificial(v, root, supply, big)
+                self.potential[v] = big
+            else:
+                self._add_artificial(root, v, -supply, big)
+                self.potential[v] = -big
+        self.parent[root] = -1
+        self.pred[root] = -1
+        self.depth[root] = 0
+        self.thread[n] = 0
+        self.rev_thread[0] = n
+        self.potential[root] = 0
+
+    def _add_artificial(self, u, v, flow, cost):
+        self.src.append(u)
+        self.dst.append(v)
+        self.cap.append(float("inf"))
+        self.cost.append(cost)
+        self.flow.append(flow)
+        self.state.append(0)
+
+    def _reduced_cost(self, a):
+        return self.cost[a] - self.potential[self.src[a]] + self.potential[self.dst[a]]
+
+    def _entering_arcs(self):
+        """
+        Yields entering arcs chosen by block search until the current solution is optimal.
+        """
+        total = len(self.src)
+        block = max(int(sqrt(total)), 1)
+        state, src, dst, cost, potential = self.state, self.src, self.dst, self.cost, self.potential
+        pos = 0
+        while True:
+            best = -1
+            best_violation = 0
+            scanned = 0
+            while scanned < total:
+                end = min(pos + block, total)
+                for a in range(pos, end):
+                    violation = state[a] * (cost[a] - potential[src[a]] + potential[dst[a]])
+                    if violation < best_violation:
+                        best_violation = violation
+                        best = a
+                scanned += end - pos
+                pos = end if end < total else 0
+                if best >= 0:
+                    break
+            if best < 0:
+                return
+            yield best
+
+    def _cycle(self, e):
+        """
+        Returns the pivot cycle of the entering arc as list of (arc, forward) pairs
+        in the order of the cycle orientation starting at the apex, forward is
+        true if the orientation is the direction of the arc.
+        """
+        first, second = self.src[e], self.dst[e]
+        if self.state[e] == -1:
+            # the flow on the entering arc is decreased
+            first, second = second, first
+        parent, pred, depth, src = self.parent, self.pred, self.depth, self.src
+
+        # walk up from both end points until the apex is reached
+        down = []   # apex ... first, in reverse
+        up = []     # second ... apex
+        u, v = first, second
+        while u != v:
+            if depth[u] >= depth[v]:
+                a = pred[u]
+                down.append((a, src[a] != u))
+                u = parent[u]
+            else:
+                a = pred[v]
+                up.append((a, src[a] == v))
+                v = parent[v]
+        down.reverse()
+        return down + [(e, self.state[e] == 1)] + up
+
+    def _residual(self, a, forward):
+        return self.cap[a] - self.flow[a] if forward else self.flow[a]
+
+    def _subtree(self, v):
+        """
+        Returns the nodes of the subtree rooted at v in thread order.
+        """
+        depth, thread = self.depth, self.thread
+        nodes = [v]
+        u = thread[v]
+        while depth[u] > depth[v]:
+            nodes.append(u)
+            u = thread[u]
+        return nodes
+
+    def _update_tree(self, e, f):
+        """
+        Replaces the leaving arc f with the entering arc e in the spanning tree.
+        """
+        parent, pred, depth, thread, rev_thread = (self.parent, self.pred,
+            self.depth, self.thread, self.rev_thread)
+
+        # the subtree cut off by removing f
+        u_out = self.src[f] if pred[self.src[f]] == f else self.dst[f]
+        nodes = self._subtree(u_out)
+        inside = set(nodes)
+        u_in, v_in = (self.src[e], self.dst[e]) if self.src[e] in inside else (self.dst[e], self.src[e])
+
+        # shift the potentials of the subtree so that e gets a reduced cost of 0
+        shift = self._reduced_cost(e)
+        if u_in == self.dst[e]:
+            shift = -shift
+        for v in nodes:
+            self.potential[v] += shift
+
+        # cut the subtree out of the thread
+        before, after = rev_thread[u_out], thread[nodes[-1]]
+        thread[before] = after
+        rev_thread[after] = before
+
+        # reverse the tree path from u_in to u_out and hang it below v_in
+        v, new_parent, new_pred = u_in, v_in, e
+        while True:
+            old_parent, old_pred = parent[v], pred[v]
+            parent[v], pred[v] = new_parent, new_pred
+            if v == u_out:
+                break
+            v, new_parent, new_pred = old_parent, v, old_pred
+
+        # preorder of the rerooted subtree
+        children = dict((v, []) for v in nodes)
+        for v in nodes:
+            if v != u_in:
+                children[parent[v]].append(v)
+        order = []
+        stack = [u_in]
+        depth[u_in] = depth[v_in] + 1
+        while stack:
+            v = stack.pop()
+            order.append(v)
+            for c in children[v]:
+                depth[c] = depth[v] + 1
+                stack.append(c)
+
+        # and insert it into the thread right after v_in
+        after = thread[v_in]
+        prev = v_in
+        for v in order:
+            thread[prev] = v
+            rev_thread[v] = prev
+            prev = v
+        thread[prev] = after
+        rev_thread[after] = prev
+
+    def run(self, tracer = None):
+        for e in self._entering_arcs():
+            cycle = self._cycle(e)
+            delta = min( self._residual(a, forward) for a, forward in cycle )
+            if delta == float("inf"):
+                raise ValueError("min cost flow problem is unbounded")
+
+            # the leaving arc is the last blocking arc along the orientation
+            for a, forward in cycle:
+                if self._residual(a, forward) == delta:
+                    f, f_forward = a, forward
+
+            if delta:
+                for a, forward in cycle:
+                    self.flow[a] += delta if forward else -delta
+            if tracer is not None:
+                tracer.augment(delta)
+
+            if f == e:
+                self.state[e] = -self.state[e]
+            else:
+                self.state[e] = 0
+                self.state[f] = -1 if f_forward else 1
+                self._update_tree(e, f)
+
+        for a in range(self.m, len(self.src)):
+            if self.flow[a]:
+                raise ValueError("demands can not be satisfied")
+
+        return self.flow[:self.m]
+
+
+def _min_cost_flow_simplex(graph, tracer):
+    """
+    Returns the per arc flow of a min cost flow in the given CSRGraph.
+    """
+    loads = _NetworkSimplex(graph).run(tracer)
+    flow = [0] * graph.arc_count()
+    for e, a in enumerate(graph.edge_arc):
+        flow[a] = loads[e]
+        flow[graph.reverse[a]] = -loads[e]
+    return flow
+
+
+def solve_min_cost_flow_simplex(graph, tracer = None):
+    """
+    Solves the min cost flow problem using the primal network simplex algorithm.
+
+    The graph can either be a Graph or a CSRGraph, in both cases the resulting
+    flow is stored in the load attribute of the edges. Raises a ValueError if
+    the demands can not be satisfied. The optional tracer (see tracing.Tracer)
+    is informed about every pivot.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze(edge_attrs=("capacity", "cost"))
+    csr.write_back("load", _min_cost_flow_simplex(csr, tracer))
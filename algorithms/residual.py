@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Residual graph of a flow.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+from graph import *
+
+
+class ResidualGraph:
+    """
+    Residual graph of a flow on a CSRGraph.
+
+    Nothing is copied, the view only keeps one flow value per arc of the
+    underlying graph. Arc a is part of the residual graph as long as
+    flow[a] < capacity[a], the flow on the twin of an arc is always the
+    negated flow of the arc itself, so pushing flow over an arc makes its
+    twin available as backward arc.
+    """
+
+    def __init__(self, graph, flow = None):
+        self.graph = graph
+        self.flow = [0] * graph.arc_count() if flow is None else flow
+
+    def residual_capacity(self, a):
+        """
+        Returns the remaining capacity of the given arc.
+        """
+        return self.graph.capacity[a] - self.flow[a]
+
+    def augment(self, arcs, amount):
+        """
+        Sends the given amount of flow along every arc in the given list.
+        """
+        flow, reverse = self.flow, self.graph.reverse
+        for a in arcs:
+            flow[a] += amount
+            flow[reverse[a]] -= amount
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Implementation of the successive shortest path algorithm to solve the min cost flow problem.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+from graph import *
+from heapq import heappush, heappop
+
+
+def _saturate_negative_arcs(graph, flow, excess):
+    """
+    Sends as much flow as possible over every arc with negative costs,
+    afterwards all arcs of the residual graph have non negative costs.
+    """
+    capacity, cost, reverse, sources, targets = (graph.capacity, graph.cost,
+        graph.reverse, graph.sources, graph.targets)
+    for a in range(graph.arc_count()):
+        if cost[a] < 0 and flow[a] < capacity[a]:
+            amount = capacity[a] - flow[a]
+            flow[a] += amount
+            flow[reverse[a]] -= amount
+            excess[sources[a]] -= amount
+            excess[targets[a]] += amount
+
+
+def _shortest_path(graph, flow, excess, potential):
+    """
+    Dijkstra from all nodes with remaining supply to the closest node with
+    remaining demand using reduced costs.
+
+    Returns the arcs of the path or None if no such node is reachable. The
+    potentials are updated so that all reduced costs stay non negative and
+    the arcs of the path have a reduced cost of 0.
+    """
+    offsets, targets, capacity, cost = graph.offsets, graph.targets, graph.capacity, graph.cost
+    n = graph.node_count()
+    dist = [None] * n
+    pred = [-1] * n
+    done = [False] * n
+    heap = []
+    for v in range(n):
+        if excess[v] > 0:
+            dist[v] = 0
+            heap.append((0, v))
+
+    sink = -1
+    while heap:
+        d, u = heappop(heap)
+        if done[u]:
+            continue    # outdated entry
+        done[u] = True
+        if excess[u] < 0:
+            sink = u
+            break
+        pu = potential[u]
+        for a in range(offsets[u], offsets[u + 1]):
+            if flow[a] >= capacity[a]:
+                continue
+            v = targets[a]
+            nd = d + cost[a] + pu - potential[v]
+            if not done[v] and (dist[v] is None or nd < dist[v]):
+                dist[v] = nd
+                pred[v] = a
+                heappush(heap, (nd, v))
+
+    if sink < 0:
+        return None
+
+    # keep the reduced costs non negative, nodes further away than the sink are treated as
+    # having the same distance
+    limit = dist[sink]
+    for v in range(n):
+        if dist[v] is not None and dist[v] < limit:
+            potential[v] += dist[v]
+        else:
+            potential[v] += limit
+
+    path = []
+    v = sink
+    while pred[v] >= 0:
+        path.append(pred[v])
+        v = graph.sources[pred[v]]
+    path.reverse()
+    return path
+
+
+def _successive_shortest_paths(graph, flow, excess, potential, tracer):
+    """
+    Augments the given flow along shortest paths from the nodes with
+    remaining supply to the nodes with remaining demand until no more
+    supply can be routed.
+
+    The reduced costs of all residual arcs must be non negative with respect
+    to the given potentials, both excess and potentials are updated.
+    """
+    capacity, reverse, sources = graph.capacity, graph.reverse, graph.sources
+    while True:
+        path = _shortest_path(graph, flow, excess, potential)
+        if path is None:
+            break
+
+        source = sources[path[0]]
+        sink = graph.targets[path[-1]]
+        amount = min([excess[source], -excess[sink]] + [capacity[a] - flow[a] for a in path])
+        for a in path:
+            flow[a] += amount
+            flow[reverse[a]] -= amount
+        excess[source] -= amount
+        excess[sink] += amount
+        if tracer is not None:
+            tracer.augment(amount)
+
+
+def _min_cost_flow_ssp(graph, tracer):
+    """
+    Returns the per arc flow of a min cost flow in the given CSRGraph.
+    """
+    flow = [0] * graph.arc_count()
+    excess = [-d for d in graph.demand]
+    potential = [0] * graph.node_count()
+
+    _saturate_negative_arcs(graph, flow, excess)
+    _successive_shortest_paths(graph, flow, excess, potential, tracer)
+
+    if any( excess ):
+        raise ValueError("demands can not be satisfied")
+
+    return flow
+
+
+def solve_min_cost_flow_ssp(graph, tracer = None):
+    """
+    Solves the min cost flow problem using the successive shortest path algorithm.
+
+    Supply is sent along shortest paths from producers to consumers, found by
+    Dijkstra's algorithm on costs reduced by node potentials. The graph can
+    either be a Graph or a CSRGraph, in both cases the resulting flow is stored
+    in the load attribute of the edges. Raises a ValueError if the demands can
+    not be satisfied. The optional tracer (see tracing.Tracer) is informed
+    about every augmentation.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze(edge_attrs=("capacity", "cost"))
+    csr.write_back("load", _min_cost_flow_ssp(csr, tracer))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Tracers to observe what the solvers are doing.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+# The solvers accept an optional tracer object and call its methods for every
+# interesting step. Without a tracer the solvers don't do any extra work.
+#
+
+
+class Tracer:
+    """
+    Base class for tracers, every hook does nothing.
+
+    Nodes are passed as the original node objects of the graph.
+    """
+
+    def push(self, src, dst, amount):
+        """
+        Called whenever load is pushed from one node to a neighbor.
+        """
+        pass
+
+    def relabel(self, node, dist):
+        """
+        Called whenever a node gets a new distance label.
+        """
+        pass
+
+    def augment(self, amount):
+        """
+        Called whenever the flow is augmented along a path or cycle.
+        """
+        pass
+
+    def phase(self, name, value = None):
+        """
+        Called at the end of a phase of a solver, value is the
+        intermediate result of that phase if there is one.
+        """
+        pass
+
+
+class CountingTracer(Tracer):
+    """
+    Only counts the operations of the solvers.
+    """
+
+    def __init__(self):
+        self.pushes = 0
+        self.relabels = 0
+        self.augmentations = 0
+        self.phases = 0
+
+    def push(self, src, dst, amount):
+        self.pushes += 1
+
+    def relabel(self, node, dist):
+        self.relabels += 1
+
+    def augment(self, amount):
+        self.augmentations += 1
+
+    def phase(self, name, value = None):
+        self.phases += 1
+
+    def counts(self):
+        """
+        Returns a dict with the current counters.
+        """
+        return {"pushes" : self.pushes,
+                "relabels" : self.relabels,
+                "augmentations" : self.augmentations,
+                "phases" : self.phases}
+
+    def __str__(self):
+        return "pushes: %i relabels: %i augmentations: %i phases: %i" % (
+            self.pushes, self.relabels, self.augmentations, self.phases)
+
+
+class PrintTracer(Tracer):
+    """
+    Prints every operation of the solvers.
+    """
+
+    def push(self, src, dst, amount):
+        print("[*] pushing %s from %s to %s" % (amount, src.name(), dst.name()))
+
+    def relabel(self, node, dist):
+        print("[*] relabeling %s to dist %i" % (node.name(), dist))
+
+    def augment(self, amount):
+        print("[*] augmenting flow by %s" % amount)
+
+    def phase(self, name, value = None):
+        if value is None:
+            print("[*] %s done" % name)
+        else:
+            print("[*] %s done: %s" % (name, value))
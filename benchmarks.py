@@ -0,0 +1,367 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Benchmarks of the solvers on seeded synthetic graphs.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+# Every benchmark runs one solver on graphs of growing size (its ladder) and
+# records the best wall time out of a few runs, the peak memory allocated by
+# the solver and, for solvers accepting a tracer, the operation counts
+# reported to a tracing.CountingTracer.
+# The results can be written as JSON and compared against an earlier run:
+#
+#   python benchmarks.py --json baseline.json
+#   python benchmarks.py --baseline baseline.json
+#
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+# the solver modules import each other by their plain names
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "algorithms")]
+
+from graph import *
+from basics import depth_first_search
+from bellman_ford import bellman_ford_cycle
+from ford_fulkerson import solve_max_flow_ff
+from max_flow import solve_max_flow
+from min_cost_flow import solve_min_cost_flow
+from min_cut import solve_min_cut
+from tracing import CountingTracer
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def grid_graph(rows, cols, max_capacity = 100, max_cost = 100, skew = 0, seed = 0):
+    """
+    Returns a grid of rows x cols nodes named 0 to rows * cols - 1 (row by row)
+    with directed edges between horizontal and vertical neighbors in both
+    directions, each with a random capacity and cost.
+
+    If skew is given every node gets a random potential of up to skew which is
+    added to the costs of its outgoing and subtracted from the costs of its
+    incoming edges, so edges get negative costs without creating negative cost
+    cycles.
+    """
+    r = random.Random(seed)
+    g = Graph(edge_attrs=("capacity", "cost", "load"))
+    n = rows * cols
+    g.add_nodes(range(n))
+    potential = [r.randint(0, skew) for v in range(n)]
+    for v in range(n):
+        neighbors = []
+        if v % cols + 1 < cols:
+            neighbors.append(v + 1)
+        if v + cols < n:
+            neighbors.append(v + cols)
+        for w in neighbors:
+            for a, b in ((v, w), (w, v)):
+                g.add_edge(a, b, {"capacity" : r.randint(1, max_capacity),
+                                  "cost" : r.randint(0, max_cost) + potential[a] - potential[b]})
+    return g
+
+
+def layered_network(layers, width, degree = 3, max_capacity = 100, seed = 0):
+    """
+    Returns a random layered max flow network and its source and target:
+    the source "s" is connected to every node of the first layer, every node
+    to degree random nodes of the next layer and every node of the last
+    layer to the target "t". Nodes in between are named (layer, position).
+    """
+    r = random.Random(seed)
+    g = Graph(edge_attrs=("capacity", "load"))
+    g.add_nodes(["s", "t"])
+    g.add_nodes([(l, i) for l in range(layers) for i in range(width)])
+    for i in range(width):
+        g.add_edge("s", (0, i), {"capacity" : r.randint(1, max_capacity)})
+        g.add_edge((layers - 1, i), "t", {"capacity" : r.randint(1, max_capacity)})
+    for l in range(layers - 1):
+        for i in range(width):
+            for j in r.sample(range(width), min(degree, width)):
+                g.add_edge((l, i), (l + 1, j), {"capacity" : r.randint(1, max_capacity)})
+    return g, g.get_node("s"), g.get_node("t")
+
+
+def netgen_transport(nodes, sources, sinks, arcs, supply, max_capacity = 100, max_cost = 100, seed = 0):
+    """
+    Returns a random min cost flow instance in the style of NETGEN: the total
+    supply is split randomly among the first sources nodes, the same amount of
+    demand among the last sinks nodes. A skeleton cycle through all nodes with
+    enough capacity keeps the instance feasible, the remaining arcs are random
+    with random capacities and costs. Nodes are named 0 to nodes - 1.
+    """
+    r = random.Random(seed)
+    g = Graph(node_attrs=("demand",), edge_attrs=("capacity", "cost", "load"))
+    g.add_nodes(range(nodes))
+    producers = list(range(sources))
+    consumers = list(range(nodes - sinks, nodes))
+
+    def split(total, parts):
+        cuts = sorted(r.randint(0, total) for i in range(parts - 1))
+        return [b - a for a, b in zip([0] + cuts, cuts + [total])]
+
+    for v, amount in zip(producers, split(supply, sources)):
+        g.get_node(v).demand = -amount
+    for v, amount in zip(consumers, split(supply, sinks)):
+        g.get_node(v).demand = amount
+
+    # skeleton: a random cycle through all nodes with enough capacity for the whole supply
+    order = list(range(nodes))
+    r.shuffle(order)
+    for a, b in zip(order, order[1:] + order[:1]):
+        g.add_edge(a, b, {"capacity" : supply, "cost" : r.randint(1, max_cost)})
+
+    count = nodes
+    while count < arcs:
+        a, b = r.sample(range(nodes), 2)
+        if not g.has_edge(a, b):
+            g.add_edge(a, b, {"capacity" : r.randint(1, max_capacity), "cost" : r.randint(1, max_cost)})
+            count += 1
+    return g
+
+
+def random_undirected(nodes, edges, max_weight = 100, seed = 0):
+    """
+    Returns a connected random graph with undirected edges of random weight:
+    a random spanning tree plus random edges until there are the given number
+    of edges. Nodes are named 0 to nodes - 1.
+    """
+    r = random.Random(seed)
+    g = Graph(edge_attrs=("weight",))
+    g.add_nodes(range(nodes))
+    for v in range(1, nodes):
+        g.add_undirected_edge(r.randrange(v), v, {"weight" : r.randint(1, max_weight)})
+    count = nodes - 1
+    while count < edges:
+        a, b = r.sample(range(nodes), 2)
+        if not g.has_edge(a, b) and not g.has_edge(b, a):
+            g.add_undirected_edge(a, b, {"weight" : r.randint(1, max_weight)})
+            count += 1
+    return g
+
+
+def _max_flow(method):
+    def run(instance, tracer):
+        g, s, t = instance
+        solve_max_flow(g, s, t, tracer, method)
+    return run
+
+
+def _min_cost_flow(method):
+    def run(g, tracer):
+        solve_min_cost_flow(g, tracer, method)
+    return run
+
+
+def _max_flow_ff(instance, tracer):
+    g, s, t = instance
+    solve_max_flow_ff(g, s, t, tracer)
+
+
+def _min_cut(g, tracer):
+    solve_min_cut(g, tracer)
+
+
+def _untraced(run):
+    """
+    Marks a runner whose solver takes no tracer, its results have no counts.
+    """
+    run.traced = False
+    return run
+
+
+def _bellman_ford_cycle(backend):
+    @_untraced
+    def run(g, tracer):
+        bellman_ford_cycle(g, backend)
+    return run
+
+
+@_untraced
+def _depth_first_search(g, tracer):
+    depth_first_search(g, 0, len(g.nodes()) - 1)
+
+
+def _transport(n, seed):
+    return netgen_transport(n, n // 10 + 1, n // 10 + 1, 5 * n, 20 * n, seed=seed)
+
+
+# name -> (instance generator taking a size and a seed, solver, size ladder)
+BENCHMARKS = {
+    "max_flow[push_relabel]" : (lambda n, seed: layered_network(n, n, seed=seed),
+                                _max_flow("push_relabel"), (10, 30, 100)),
+    "max_flow[dinic]" : (lambda n, seed: layered_network(n, n, seed=seed),
+                         _max_flow("dinic"), (10, 30, 100)),
+    "max_flow_ff" : (lambda n, seed: layered_network(n, n, seed=seed),
+                     _max_flow_ff, (10, 20, 40)),
+    "min_cost_flow[cycle_cancelling]" : (_transport, _min_cost_flow("cycle_cancelling"), (50, 100, 200)),
+    "min_cost_flow[ssp]" : (_transport, _min_cost_flow("ssp"), (50, 200, 1000)),
+    "min_cost_flow[simplex]" : (_transport, _min_cost_flow("simplex"), (50, 200, 1000)),
+    "min_cost_flow[cost_scaling]" : (_transport, _min_cost_flow("cost_scaling"), (50, 200, 1000)),
+    "min_cut" : (lambda n, seed: random_undirected(n, 5 * n, seed=seed), _min_cut, (50, 100, 200)),
+    "bellman_ford_cycle" : (lambda n, seed: grid_graph(n, n, skew=100 * n, seed=seed),
+                            _bellman_ford_cycle("python"), (30, 100, 300)),
+    "depth_first_search" : (lambda n, seed: grid_graph(n, n, seed=seed),
+                            _depth_first_search, (30, 100, 300)),
+}
+
+if numpy is not None:
+    BENCHMARKS["bellman_ford_cycle[numpy]"] = (BENCHMARKS["bellman_ford_cycle"][0],
+                                               _bellman_ford_cycle("numpy"), (30, 100, 300))
+
+
+def _graph_of(instance):
+    return instance[0] if isinstance(instance, tuple) else instance
+
+
+def _frozen(instance):
+    """
+    Returns the instance with its graph replaced by a snapshot carrying all
+    attributes the solvers read.
+    """
+    if isinstance(instance, tuple):
+        return (instance[0].freeze(),) + instance[1:]
+    return instance.freeze()
+
+
+def measure(name, size, repeat = 3, seed = 0):
+    """
+    Runs the named benchmark on the instance of the given size.
+
+    Returns a dict with the size of the graph, the best wall time of the given
+    number of runs, the peak memory allocated during a separate run and the
+    operation counts of that run (only for solvers which accept a tracer).
+    The graph is frozen once beforehand, so time and memory are those of the
+    solver alone and not of building the snapshot.
+    """
+    generate, run, ladder = BENCHMARKS[name]
+    instance = generate(size, seed)
+    graph = _graph_of(instance)
+    instance = _frozen(instance)
+
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        run(instance, None)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    # memory and counts are measured separately, both slow the solver down
+    traced = getattr(run, "traced", True)
+    tracer = CountingTracer() if traced else None
+    tracemalloc.start()
+    try:
+        run(instance, tracer)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    result = {"benchmark" : name,
+              "size" : size,
+              "nodes" : len(graph.nodes()),
+              "edges" : len(graph.edges()),
+              "time" : best,
+              "peak_memory" : peak}
+    if traced:
+        result["counts"] = tracer.counts()
+    return result
+
+
+def run_benchmarks(names = None, quick = False, repeat = 3, seed = 0, out = sys.stdout):
+    """
+    Runs the given benchmarks (all by default) on their whole ladder, or
+    only its first two sizes if quick is true, and returns the results
+    together with a description of the machine.
+    """
+    results = []
+    for name in names or sorted(BENCHMARKS):
+        if not name in BENCHMARKS:
+            raise ValueError("unknown benchmark %s" % name)
+        ladder = BENCHMARKS[name][2]
+        for size in ladder[:2] if quick else ladder:
+            result = measure(name, size, repeat, seed)
+            results.append(result)
+            if out is not None:
+                out.write("%-34s %5i %8i nodes %9i edges %10.4fs %12i bytes\n" % (name, size,
+                    result["nodes"], result["edges"], result["time"], result["peak_memory"]))
+                out.flush()
+
+    return {"python" : platform.python_version(),
+            "implementation" : platform.python_implementation(),
+            "machine" : platform.machine(),
+            "seed" : seed,
+            "results" : results}
+
+
+def compare(results, baseline, threshold = 1.25):
+    """
+    Compares the results with those of a baseline run.
+
+    Returns a list of (benchmark, size, time ratio, memory ratio) for every
+    benchmark and size present in both and the list of entries whose time or
+    peak memory grew by more than the given factor.
+    """
+    old = dict(((r["benchmark"], r["size"]), r) for r in baseline["results"])
+    ratios = []
+    regressions = []
+    for r in results["results"]:
+        key = (r["benchmark"], r["size"])
+        if not key in old:
+            continue
+        base = old[key]
+        entry = (r["benchmark"], r["size"],
+                 r["time"] / base["time"] if base["time"] else None,
+                 float(r["peak_memory"]) / base["peak_memory"] if base["peak_memory"] else None)
+        ratios.append(entry)
+        if any( ratio is not None and ratio > threshold for ratio in entry[2:] ):
+            regressions.append(entry)
+    return ratios, regressions
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description="Benchmarks of the solvers on seeded synthetic graphs.")
+    parser.add_argument("names", nargs="*", help="benchmarks to run (all by default): %s" %
+                        ", ".join(sorted(BENCHMARKS)))
+    parser.add_argument("--quick", action="store_true", help="only run the two smallest sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per size, the best is kept")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the graph generators")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="compare the results against this earlier JSON file")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="time or memory ratio above which a result counts as regression")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.names, args.quick, args.repeat, args.seed)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        ratios, regressions = compare(results, baseline, args.threshold)
+        print("")
+        for name, size, time_ratio, memory_ratio in ratios:
+            print("%-34s %5i time x%s memory x%s" % (name, size,
+                "%.2f" % time_ratio if time_ratio is not None else "-",
+                "%.2f" % memory_ratio if memory_ratio is not None else "-"))
+        if regressions:
+            print("[*] %i regressions above x%.2f" % (len(regressions), args.threshold))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
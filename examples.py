@@ -11,6 +11,7 @@ from algorithms.basics import *
 from algorithms.max_flow import solve_max_flow
 from algorithms.min_cost_flow import solve_min_cost_flow
 from algorithms.min_cut import solve_min_cut
+from algorithms.tracing import PrintTracer
 
 
 def max_flow():
@@ -32,7 +33,7 @@ def max_flow():
     g.add_edge("E", "T", {"capacity" : 7})
     g.add_edge("F", "T", {"capacity" : 27})
 
-    solve_max_flow(g, g.get_node("S"), g.get_node("T"))
+    solve_max_flow(g, g.get_node("S"), g.get_node("T"), PrintTracer())
     print(g)
 
 def min_cost():
@@ -57,7 +58,7 @@ def min_cost():
     g.add_edge("H", "G", {"capacity" : 6, "cost" : 1})
 
     print(g)
-    solve_min_cost_flow(g)
+    solve_min_cost_flow(g, PrintTracer())
     print(g)
 
 def min_cut():
@@ -71,7 +72,9 @@ def min_cut():
     g.add_undirected_edge("C", "D", {"weight": 2})
     g.add_undirected_edge("D", "E", {"weight": 1})
 
-    solve_min_cut(g)
+    cut, side = solve_min_cut(g, PrintTracer())
+    print("[*] minimun cut found: %i" % cut)
+    print("[*] one side of the cut: %s" % ", ".join(node.name() for node in side))
 
 if __name__ == "__main__":
     print("=====================================")
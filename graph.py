@@ -7,16 +7,53 @@
 #
 
 from collections import OrderedDict          # use ordered dicts to preserve element ordering     
+from array import array
+import io
+import json
+import mmap as _mmap
+import sys
 
 class Graph:
     """
     Represents a graph.
+
+    Optionally the names of the node and edge attributes can be declared up front,
+    e.g. Graph(edge_attrs=("capacity", "cost", "load")). Nodes and edges of such a
+    graph store the declared attributes in slots instead of a per instance dict,
+    which considerably reduces the memory needed for large graphs. Undeclared
+    attributes can not be set on such nodes and edges. The solvers store their
+    results on the original edges (e.g. the load of a flow) even when run on
+    freeze(), so these attributes have to be declared as well.
     """
 
-    def __init__(self):
+    def __init__(self, node_attrs = None, edge_attrs = None):
         self._nodes = OrderedDict()
-        self._edges = []
-
+        self._edges = OrderedDict()     # edge -> None, used as insertion ordered set
+        self._node_class = _Node
+        self._edge_class = _Edge
+        self._undirected_edge_class = _UndirectedEdge
+        if node_attrs is not None:
+            self._node_class = _schema_class(Node, node_attrs)
+        if edge_attrs is not None:
+            self._edge_class = _schema_class(Edge, edge_attrs)
+            self._undirected_edge_class = _schema_class(UndirectedEdge, edge_attrs)
+
+    _CLASSES = ("_node_class", "_edge_class", "_undirected_edge_class")
+
+    def __getstate__(self):
+        # the generated schema classes are pickled as their base class and attributes
+        state = dict(self.__dict__)
+        for name in self._CLASSES:
+            cls = state[name]
+            if hasattr(cls, "_schema"):
+                state[name] = (cls.__bases__[0], cls._schema)
+        return state
+
+    def __setstate__(self, state):
+        for name in self._CLASSES:
+            if isinstance(state[name], tuple):
+                state[name] = _schema_class(*state[name])
+        self.__dict__.update(state)
 
     def nodes(self):
         """
@@ -45,7 +82,7 @@ class Graph:
         """
         if self.has_node(name):
             raise ValueError("Node %s already exists" % name)
-        self._nodes[name] = Node(name, data)
+        self._nodes[name] = self._node_class(name, data)
         return self._nodes[name]
 
     def add_nodes(self, l):
@@ -63,9 +100,8 @@ class Graph:
         """
         node = self._node_lookup([n])
         # remove all edges to/from the node first
-        for edge in self.edges():
-            if node in edge.nodes():
-                self.remove_edge(edge)
+        for edge in node.outgoing_edges() + node.incoming_edges():
+            self.remove_edge(edge)
         del self._nodes[node.name()]
 
     def remove_nodes(self, l):
@@ -84,12 +120,34 @@ class Graph:
         srcnode, dstnode = self._node_lookup([src, dst])
         if srcnode is None or dstnode is None:
             raise ValueError("No such node in this graph")
-        edge = Edge(srcnode, dstnode, data)
-        self._edges.append(edge)
+        edge = self._edge_class(srcnode, dstnode, data)
+        self._edges[edge] = None
         srcnode._add_outgoing_edge(edge)
         dstnode._add_incoming_edge(edge)
         return edge
 
+    def add_edges(self, l):
+        """
+        Add multiple (directed) edges given as (src, dst, data) tuples.
+
+        Returns a list of the created edge objects.
+        """
+        ret = []
+        nodes = self._nodes
+        edges = self._edges
+        edge_class = self._edge_class
+        for src, dst, data in l:
+            srcnode = src if isinstance(src, Node) and nodes.get(src._name) is src else nodes.get(src)
+            dstnode = dst if isinstance(dst, Node) and nodes.get(dst._name) is dst else nodes.get(dst)
+            if srcnode is None or dstnode is None:
+                raise ValueError("No such node in this graph")
+            edge = edge_class(srcnode, dstnode, data)
+            edges[edge] = None
+            srcnode._outgoing_edges[dstnode] = edge
+            dstnode._incoming_edges[srcnode] = edge
+            ret.append(edge)
+        return ret
+
     def add_undirected_edge(self, n1, n2, data = None):
         """
         Add an undirected edge between the two given nodes.
@@ -99,8 +157,8 @@ class Graph:
         first, second = self._node_lookup([n1, n2])
         if first is None or second is None:
             raise ValueError("No such node in this graph")
-        edge = UndirectedEdge(first, second, data)
-        self._edges.append(edge)
+        edge = self._undirected_edge_class(first, second, data)
+        self._edges[edge] = None
         first._add_undirected_edge(edge)
         second._add_undirected_edge(edge)
         return edge
@@ -111,7 +169,7 @@ class Graph:
         """
         if not edge in self._edges:
             return
-        self._edges.remove(edge)
+        del self._edges[edge]
         if edge.is_directed():
             edge.source()._remove_outgoing_edge(edge)
             edge.destination()._remove_incoming_edge(edge)
@@ -124,7 +182,7 @@ class Graph:
         Removes all edges in the given list
         """
         for edge in l:
-            self.remove_edge(l)
+            self.remove_edge(edge)
 
     def get_node(self, name):
         """
@@ -182,7 +240,7 @@ class Graph:
         Removes all nodes and edges from this graph.
         """
         self._nodes = OrderedDict()
-        self._edges = []
+        self._edges = OrderedDict()
 
     def reset(self):
         """
@@ -193,6 +251,66 @@ class Graph:
         for node in self.nodes():
             node.clear()
 
+    @classmethod
+    def from_arrays(cls, names, sources, targets, edge_columns = None, node_columns = None,
+                    undirected = False):
+        """
+        Builds a graph from edge lists, the arguments are the same as
+        for CSRGraph.from_arrays().
+        """
+        graph = cls()
+        node_columns = list((node_columns or {}).items())
+        edge_columns = list((edge_columns or {}).items())
+        nodes = [graph.add_node(name, dict((key, values[i]) for key, values in node_columns))
+                 for i, name in enumerate(names)]
+
+        if undirected is False:
+            graph.add_edges((nodes[sources[e]], nodes[targets[e]],
+                             dict((key, values[e]) for key, values in edge_columns))
+                            for e in range(len(sources)))
+            return graph
+        for e in range(len(sources)):
+            data = dict((key, values[e]) for key, values in edge_columns)
+            if undirected is True or undirected[e]:
+                graph.add_undirected_edge(nodes[sources[e]], nodes[targets[e]], data)
+            else:
+                graph.add_edge(nodes[sources[e]], nodes[targets[e]], data)
+        return graph
+
+    def freeze(self, edge_attrs = None, node_attrs = None):
+        """
+        Returns an immutable, integer indexed snapshot of this graph.
+
+        See CSRGraph for a description of the layout.
+        """
+        return CSRGraph.from_graph(self, edge_attrs, node_attrs)
+
+    def save(self, path, edge_attrs = None, node_attrs = None):
+        """
+        Writes this graph to the given file in the binary format described in
+        CSRGraph.save().
+
+        By default all numeric edge and node attributes are stored, always
+        including the ones the solvers read (capacity, cost, weight and load
+        of the edges, demand of the nodes) so a missing one is stored as 0.
+        """
+        if edge_attrs is None:
+            edge_attrs = _numeric_attributes(self.edges(), CSRGraph.EDGE_ATTRS + ("load",))
+        if node_attrs is None:
+            node_attrs = _numeric_attributes(self.nodes(), CSRGraph.NODE_ATTRS)
+        self.freeze(edge_attrs, node_attrs).save(path)
+
+    @staticmethod
+    def load(path, mmap = True):
+        """
+        Reads a graph written by save().
+
+        Returns the frozen graph (see CSRGraph.load()), its arrays are memory
+        mapped if mmap is true so processes loading the same file share one
+        page cached copy of it.
+        """
+        return CSRGraph.load(path, mmap)
+
     def _node_lookup(self, l):
         """
         Returns the graphs node object or None for the given node/node name or every
@@ -203,8 +321,9 @@ class Graph:
         """
         res = []
         for obj in l:
-            if obj in self.nodes():
-                res.append(obj)
+            if isinstance(obj, Node):
+                # only accept node objects which actually belong to this graph
+                res.append(obj if self._nodes.get(obj._name) is obj else None)
             else:
                 res.append(self._nodes.get(obj))
 
@@ -225,12 +344,20 @@ class Graph:
 class Node:
     """
     Represents a node in a graph.
+
+    The generated schema classes (see Graph) derive from this class, so it has
+    no per instance dict: a Node created directly can't carry custom attributes.
+    Nodes created by a Graph without a schema, or instances of a subclass
+    without __slots__, can.
     """
 
+    __slots__ = ("_name", "_outgoing_edges", "_incoming_edges")
+    _adjacency = OrderedDict
+
     def __init__(self, name, data = None):
         self._name = name
-        self._outgoing_edges = OrderedDict()
-        self._incoming_edges = OrderedDict()
+        self._outgoing_edges = self._adjacency()
+        self._incoming_edges = self._adjacency()
         if data is not None:
             for key, value in data.items():
                 setattr(self, key, value)
@@ -307,15 +434,13 @@ class Node:
         """
         Removes all custom attributes from this node.
         """
-        for key, value in vars(self).items():
-            if not key.startswith("_"):
-                delattr(self, key)
+        for key, value in _custom_attributes(self):
+            delattr(self, key)
 
     def __str__(self):
         res = self._name + "\n"
-        for key, value in vars(self).items():
-            if not key.startswith("_"):
-                res += "    " + str(key) + " : " + str(value) + "\n"
+        for key, value in _custom_attributes(self):
+            res += "    " + str(key) + " : " + str(value) + "\n"
 
         return res
 
@@ -323,8 +448,13 @@ class Node:
 class Edge:
     """
     Represents an edge between two nodes in a graph.
+
+    Like Node this class has no per instance dict, an Edge created directly
+    can't carry custom attributes, edges created by a Graph without a schema can.
     """
 
+    __slots__ = ("_node1", "_node2")
+
     def __init__(self, node1, node2, data = None):
         self._node1 = node1
         self._node2 = node2
@@ -366,15 +496,13 @@ class Edge:
         """
         Removes all custom attributes from this edge.
         """
-        for key, value in vars(self).items():
-            if not key.startswith("_"):
-                delattr(self, key)
+        for key, value in _custom_attributes(self):
+            delattr(self, key)
 
     def __str__(self):
         res = self._node1.name() + " --> " + self._node2.name() + "\n"
-        for key, value in vars(self).items():
-            if not key.startswith("_"):
-                res += "    " + str(key) + " : " + str(value) + "\n"
+        for key, value in _custom_attributes(self):
+            res += "    " + str(key) + " : " + str(value) + "\n"
 
         return res
 
@@ -382,8 +510,12 @@ class Edge:
 class UndirectedEdge(Edge):
     """
     Represents an undirected edge between two nodes.
+
+    As for Edge, custom attributes need an edge created by a Graph.
     """
 
+    __slots__ = ()
+
     def source(self):
         return None     # no source or destination defined for undirected edges
 
@@ -407,13 +539,89 @@ class UndirectedEdge(Edge):
 
     def __str__(self):
         res = self._node1.name() + " <--> " + self._node2.name() + "\n"
-        for key, value in vars(self).items():
-            if not key.startswith("_"):
-                res += "    " + str(key) + " : " + str(value) + "\n"
+        for key, value in _custom_attributes(self):
+            res += "    " + str(key) + " : " + str(value) + "\n"
 
         return res
 
 
+# node and edge classes used by graphs without an attribute schema,
+# custom attributes are stored in a per instance dict
+class _Node(Node):
+    pass
+
+class _Edge(Edge):
+    pass
+
+class _UndirectedEdge(UndirectedEdge):
+    pass
+
+
+_schema_classes = {}
+
+def _schema_class(cls, attrs):
+    """
+    Returns a subclass of the given node/edge class which keeps the given
+    custom attributes in slots and has no per instance dict.
+    """
+    attrs = tuple(attrs)
+    for attr in attrs:
+        if not attr.isidentifier() or attr.startswith("_"):
+            raise ValueError("Invalid attribute name %s" % attr)
+    key = (cls, attrs)
+    if not key in _schema_classes:
+        namespace = {"__slots__" : attrs,
+                     "__module__" : cls.__module__,
+                     "_schema" : attrs}
+        if issubclass(cls, Node):
+            # plain dicts preserve insertion order as well and are a lot smaller
+            namespace["_adjacency"] = dict
+        namespace["__reduce_ex__"] = _reduce_schema_object
+        _schema_classes[key] = type(cls.__name__, (cls,), namespace)
+
+    return _schema_classes[key]
+
+def _reduce_schema_object(obj, protocol):
+    """
+    Pickles nodes/edges of a schema class by their base class and attributes,
+    the generated classes can't be looked up by name.
+    """
+    cls = type(obj)
+    state = object.__reduce_ex__(obj, 2)[2]
+    return (_new_schema_object, (cls.__bases__[0], cls._schema), state)
+
+def _new_schema_object(cls, attrs):
+    schema = _schema_class(cls, attrs)
+    return schema.__new__(schema)
+
+def _numeric_attributes(objs, known = ()):
+    """
+    Returns the names of the custom attributes which only have numeric values on the given nodes/edges.
+    The known attributes are included even if no node/edge has them.
+    """
+    names = OrderedDict((key, True) for key in known)
+    for obj in objs:
+        for key, value in _custom_attributes(obj):
+            numeric = isinstance(value, (int, float)) and not isinstance(value, bool)
+            names[key] = names.get(key, True) and numeric
+
+    return [name for name, numeric in names.items() if numeric]
+
+def _custom_attributes(obj):
+    """
+    Returns a list of (name, value) pairs for all custom attributes of a node or edge.
+    """
+    res = []
+    for key in getattr(obj, "_schema", ()):
+        if hasattr(obj, key):
+            res.append((key, getattr(obj, key)))
+    for key, value in getattr(obj, "__dict__", {}).items():
+        if not key.startswith("_"):
+            res.append((key, value))
+
+    return res
+
+
 class Path:
     """
     Represents a path between two nodes.
@@ -485,7 +693,11 @@ class Path:
         """
         Adds a new node and the corresponding edge to this path.
         """
-        if not edge.source() == self._nodes[-1] or not edge.destination() == node:
+        if edge.is_directed():
+            connecting = edge.source() == self._nodes[-1] and edge.destination() == node
+        else:
+            connecting = edge.nodes() in ([self._nodes[-1], node], [node, self._nodes[-1]])
+        if not connecting:
             raise ValueError("Edge is not connecting the new and the previous node")
         self._nodes.append(node)
         self._edges.append(edge)
@@ -508,3 +720,374 @@ class Path:
             res += str(edge)
 
         return res
+
+
+class CSRGraph:
+    """
+    Immutable snapshot of a graph in compressed sparse row form.
+
+    Nodes are identified by their position in nodes(), arcs by their position in
+    the targets array. The arcs leaving node i are offsets[i] to offsets[i + 1] - 1.
+
+    Every directed edge of the original graph is stored as a forward arc and a
+    residual twin in the opposite direction, an undirected edge as one arc per
+    direction. reverse[a] is the index of the twin of arc a, arc_edge[a] the index
+    of the original edge in edges() or -1 if the arc is a residual twin, and
+    edge_arc[e] the forward arc of edge e.
+
+    Numeric edge attributes are stored as typed per arc columns (residual twins
+    carry a capacity/weight of 0 and the negated cost), node attributes as per
+    node columns. Missing attributes are treated as 0 (see arc_column()).
+
+    The arrays must not be modified, solvers keep their state in local arrays
+    and use write_back() to store results on the original edges.
+    """
+
+    EDGE_ATTRS = ("capacity", "cost", "weight")
+    NODE_ATTRS = ("demand",)
+
+    def __init__(self, nodes, edges, offsets, targets, sources, reverse, arc_edge, edge_arc,
+                 arc_columns, node_columns, names = None):
+        # nodes and edges can be None if the node names are given instead,
+        # they are then created on first use (see _originals())
+        self._nodes = nodes
+        self._edges = edges
+        if names is None:
+            names = [node.name() for node in nodes]
+        self._index = dict((name, i) for i, name in enumerate(names))
+        self.offsets = offsets
+        self.targets = targets
+        self.sources = sources
+        self.reverse = reverse
+        self.arc_edge = arc_edge
+        self.edge_arc = edge_arc
+        self.arc_columns = arc_columns
+        self.node_columns = node_columns
+        self.capacity = self.arc_column("capacity")
+        self.cost = self.arc_column("cost")
+        self.weight = self.arc_column("weight")
+        self.demand = self.node_column("demand")
+
+    @classmethod
+    def from_graph(cls, graph, edge_attrs = None, node_attrs = None):
+        """
+        Builds the snapshot of the given graph.
+
+        By default the capacity, cost and weight edge attributes as well as the
+        demand node attribute are copied into columns.
+        """
+        edge_attrs = cls.EDGE_ATTRS if edge_attrs is None else tuple(edge_attrs)
+        node_attrs = cls.NODE_ATTRS if node_attrs is None else tuple(node_attrs)
+        nodes = graph.nodes()
+        edges = graph.edges()
+        index = dict((node, i) for i, node in enumerate(nodes))
+
+        first = [index[edge._node1] for edge in edges]
+        second = [index[edge._node2] for edge in edges]
+        undirected = [not edge.is_directed() for edge in edges]
+        edge_columns = dict((name, [getattr(edge, name, 0) for edge in edges]) for name in edge_attrs)
+        node_columns = dict((name, [getattr(node, name, 0) for node in nodes]) for name in node_attrs)
+        return cls._build(nodes, edges, None, first, second, undirected, edge_columns, node_columns)
+
+    @classmethod
+    def from_arrays(cls, names, sources, targets, edge_columns = None, node_columns = None,
+                    undirected = False):
+        """
+        Builds a snapshot directly from edge lists, without a Graph.
+
+        names is the list of node names, sources and targets contain the node
+        numbers of the end points of every edge. edge_columns and node_columns
+        map attribute names to sequences of per edge/per node values, undirected
+        is either a flag for all edges or a sequence of per edge flags. The node
+        and edge objects are created on first use (see nodes()/edges()).
+        """
+        if isinstance(undirected, bool):
+            undirected = [undirected] * len(sources)
+        return cls._build(None, None, names, sources, targets, undirected,
+                          edge_columns or {}, node_columns or {})
+
+    @classmethod
+    def _build(cls, nodes, edges, names, first, second, undirected, edge_columns, node_columns):
+        n = len(nodes if names is None else names)
+        count = len(first)
+
+        # count the arcs leaving every node, each edge adds one arc to both end points
+        offsets = [0] * (n + 1)
+        for u in first:
+            offsets[u + 1] += 1
+        for v in second:
+            offsets[v + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+
+        # place the forward arcs and their twins
+        m = offsets[-1]
+        fill = offsets[:-1]
+        targets = [0] * m
+        sources = [0] * m
+        reverse = [0] * m
+        arc_edge = [-1] * m
+        edge_arc = [0] * count
+        for e in range(count):
+            u = first[e]
+            v = second[e]
+            a = fill[u]
+            fill[u] += 1
+            b = fill[v]
+            fill[v] += 1
+            sources[a], targets[a] = u, v
+            sources[b], targets[b] = v, u
+            reverse[a], reverse[b] = b, a
+            arc_edge[a] = e
+            if undirected[e]:
+                arc_edge[b] = e
+            edge_arc[e] = a
+
+        arc_columns = {}
+        for name, values in edge_columns.items():
+            column = [0] * m
+            for e in range(count):
+                value = values[e]
+                a = edge_arc[e]
+                column[a] = value
+                if undirected[e]:
+                    column[reverse[a]] = value
+                elif name == "cost":
+                    column[reverse[a]] = -value
+            arc_columns[name] = _column(column)
+
+        node_columns = dict((name, _column(values)) for name, values in node_columns.items())
+
+        return cls(nodes, edges, _column(offsets), _column(targets), _column(sources),
+                   _column(reverse), _column(arc_edge), _column(edge_arc),
+                   arc_columns, node_columns, names)
+
+    def nodes(self):
+        """
+        Returns the original node objects, indexed by node number.
+        """
+        return list(self._originals()[0])
+
+    def edges(self):
+        """
+        Returns the original edge objects, indexed by edge number.
+        """
+        return list(self._originals()[1])
+
+    def node(self, i):
+        """
+        Returns the original node object with the given number.
+        """
+        return self._originals()[0][i]
+
+    def node_count(self):
+        """
+        Returns the number of nodes in this graph.
+        """
+        return len(self.offsets) - 1
+
+    def arc_count(self):
+        """
+        Returns the number of arcs (including residual twins) in this graph.
+        """
+        return len(self.targets)
+
+    def empty(self):
+        """
+        Returns true if this graph does not contain any nodes.
+        """
+        return self.node_count() == 0
+
+    def node_index(self, n):
+        """
+        Returns the number of the given node/node name.
+        """
+        if isinstance(n, Node):
+            n = n.name()
+        if not n in self._index:
+            raise ValueError("No such node in this graph")
+        return self._index[n]
+
+    def is_directed(self):
+        """
+        A graph is considered directed if all of its edges are directed.
+        """
+        # the twin of a directed edge's arc is a residual arc
+        reverse, arc_edge = self.reverse, self.arc_edge
+        return all( arc_edge[reverse[a]] < 0 for a in self.edge_arc )
+
+    def is_undirected(self):
+        """
+        A graph is considered undirected if all of its edges are undirected.
+        """
+        reverse, arc_edge = self.reverse, self.arc_edge
+        return all( arc_edge[reverse[a]] >= 0 for a in self.edge_arc )
+
+    def arc_column(self, name):
+        """
+        Returns the per arc column of the given edge attribute, all 0 if it
+        was not copied into this snapshot.
+        """
+        if name in self.arc_columns:
+            return self.arc_columns[name]
+        return _column([0] * self.arc_count())
+
+    def node_column(self, name):
+        """
+        Returns the per node column of the given node attribute, all 0 if it
+        was not copied into this snapshot.
+        """
+        if name in self.node_columns:
+            return self.node_columns[name]
+        return _column([0] * self.node_count())
+
+    def path(self, start, arcs):
+        """
+        Returns a path object made of the original nodes and edges
+        starting at the given node number and following the given arcs.
+        """
+        nodes, edges = self._originals()
+        path = Path(nodes[start])
+        for a in arcs:
+            path.append(edges[self.arc_edge[a]], nodes[self.targets[a]])
+        return path
+
+    def write_back(self, name, arc_values):
+        """
+        Stores the value of every edge's forward arc in the given per arc
+        sequence as attribute of the original edge object.
+        """
+        for e, edge in enumerate(self._originals()[1]):
+            setattr(edge, name, arc_values[self.edge_arc[e]])
+
+    def _originals(self):
+        """
+        Returns the lists of original nodes and edges. For a loaded graph they
+        are created on first use as part of a new Graph, carrying the stored
+        attributes.
+        """
+        if self._nodes is None:
+            arcs = self.edge_arc
+            edge_columns = dict((name, [column[a] for a in arcs]) for name, column in self.arc_columns.items())
+            undirected = [self.arc_edge[self.reverse[a]] >= 0 for a in arcs]
+            graph = Graph.from_arrays(list(self._index), [self.sources[a] for a in arcs],
+                                      [self.targets[a] for a in arcs], edge_columns,
+                                      self.node_columns, undirected)
+            self._nodes = graph.nodes()
+            self._edges = graph.edges()
+
+        return self._nodes, self._edges
+
+    # layout of the binary format, see save()
+    _MAGIC = b"ALGOPYG1"
+    _ARRAYS = ("offsets", "targets", "sources", "reverse", "arc_edge", "edge_arc")
+
+    def save(self, path):
+        """
+        Writes this graph to the given file.
+
+        The file starts with a magic string and the length of a JSON header,
+        followed by the header and the arrays. The header contains the node
+        name table (so node names must be strings or integers), the byte order
+        and the type, position and length of every array: the CSR arrays
+        described above followed by the per arc and per node attribute columns.
+        Every array starts at a multiple of 8 bytes so it can be memory mapped.
+        """
+        with open(path, "wb") as f:
+            self._write(f, True)
+
+    def to_bytes(self, names = True):
+        """
+        Returns this graph in the format written by save(). Without the node
+        name table (if names is false) the nodes are named by their numbers
+        when the graph is read back by from_bytes().
+        """
+        f = io.BytesIO()
+        self._write(f, names)
+        return f.getvalue()
+
+    def _write(self, f, names):
+        names = list(self._index) if names else None
+        for name in names or ():
+            if not isinstance(name, (str, int)):
+                raise ValueError("Node names must be strings or integers to be saved")
+
+        arrays = [(name, getattr(self, name)) for name in self._ARRAYS]
+        arrays += [("arc:" + name, column) for name, column in self.arc_columns.items()]
+        arrays += [("node:" + name, column) for name, column in self.node_columns.items()]
+
+        # positions are relative to the end of the padded header
+        layout = {}
+        pos = 0
+        for name, column in arrays:
+            layout[name] = (column.format, pos, len(column))
+            pos += (column.nbytes + 7) // 8 * 8
+        header = json.dumps({"byteorder": sys.byteorder, "names": names, "arrays": layout}).encode("utf-8")
+        header += b" " * (-(len(self._MAGIC) + 8 + len(header)) % 8)
+
+        f.write(self._MAGIC)
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        for name, column in arrays:
+            f.write(column)
+            f.write(bytes(-column.nbytes % 8))
+
+    @classmethod
+    def load(cls, path, mmap = True):
+        """
+        Reads a graph written by save().
+
+        If mmap is true the arrays are read-only views of the memory mapped
+        file, otherwise they are read into memory. The node and edge objects
+        are only created when they are needed, e.g. by nodes(), edges() or
+        write_back().
+        """
+        with open(path, "rb") as f:
+            if mmap:
+                data = memoryview(_mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ))
+            else:
+                data = memoryview(f.read())
+        return cls._read(data, path)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Reads a graph returned by to_bytes(), the arrays are views of the given data.
+        """
+        return cls._read(memoryview(data).toreadonly(), "data")
+
+    @classmethod
+    def _read(cls, data, source):
+        magic = len(cls._MAGIC)
+        if data[:magic] != cls._MAGIC:
+            raise ValueError("%s is not a graph file" % source)
+        length = int.from_bytes(data[magic:magic + 8], "little")
+        header = json.loads(data[magic + 8:magic + 8 + length].tobytes().decode("utf-8"))
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError("%s was written on a machine with a different byte order" % source)
+        start = magic + 8 + length
+
+        arrays = {}
+        for name, (typecode, pos, count) in header["arrays"].items():
+            begin = start + pos
+            arrays[name] = data[begin:begin + count * 8].cast(typecode)
+        arc_columns = dict((name[4:], column) for name, column in arrays.items() if name.startswith("arc:"))
+        node_columns = dict((name[5:], column) for name, column in arrays.items() if name.startswith("node:"))
+        names = header["names"]
+        if names is None:
+            names = range(len(arrays["offsets"]) - 1)
+
+        return cls(None, None, *[arrays[name] for name in cls._ARRAYS],
+                   arc_columns=arc_columns, node_columns=node_columns, names=names)
+
+
+def _column(values):
+    """
+    Packs the given list of numbers into a compact read-only column.
+    """
+    try:
+        column = array("q", values)
+    except (TypeError, OverflowError):
+        # floats or integers which don't fit into 64 bit
+        column = array("d", values)
+    return memoryview(column).toreadonly()
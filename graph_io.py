@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Streaming readers and writers for DIMACS and CSV graph files.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+from graph import *
+from graph import _numeric_attributes
+from array import array
+import csv
+
+# number of bytes of lines parsed at once
+CHUNK_SIZE = 1 << 20
+
+
+def _number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _append(columns, name, value):
+    """
+    Appends the value to the named typed column, switching it from
+    integers to floats when the first float shows up.
+    """
+    try:
+        columns[name].append(value)
+    except (TypeError, OverflowError):
+        columns[name] = array("d", columns[name])
+        columns[name].append(value)
+
+
+def _build(names, sources, targets, edge_columns, node_columns, undirected, frozen):
+    cls = CSRGraph if frozen else Graph
+    return cls.from_arrays(names, sources, targets, edge_columns, node_columns, undirected)
+
+
+def read_dimacs(path, frozen = False):
+    """
+    Reads a DIMACS max flow ("p max") or min cost flow ("p min") file.
+
+    The file is parsed in chunks straight into typed arrays from which the
+    graph is built at once, either a Graph or, if frozen is true, a CSRGraph.
+    Nodes are named 1 to n. Arc lines set the capacity (and cost) of the edges,
+    node lines the demand of the nodes (the negated supply given in the file)
+    or the source/sink of a max flow problem. Lower bounds are not supported,
+    a ValueError is raised if the problem line is missing or does not come
+    before the node and arc lines.
+
+    Returns the graph as well as the source and sink (None for min cost flow
+    problems): the node objects of a Graph or the node names for a CSRGraph.
+    """
+    problem = None
+    n = 0
+    source = sink = None
+    sources = array("q")
+    targets = array("q")
+    columns = {}
+    demand = None
+
+    with open(path) as f:
+        while True:
+            lines = f.readlines(CHUNK_SIZE)
+            if not lines:
+                break
+            for line in lines:
+                line = line.strip()
+                kind = line[:1]
+                if problem is None and kind in ("a", "n"):
+                    raise ValueError("%s contains %s lines before the problem line" % (path, kind))
+                if kind == "a":
+                    fields = line.split()
+                    sources.append(int(fields[1]) - 1)
+                    targets.append(int(fields[2]) - 1)
+                    if problem == "max":
+                        _append(columns, "capacity", _number(fields[3]))
+                    else:
+                        if _number(fields[3]) != 0:
+                            raise ValueError("lower bounds are not supported")
+                        _append(columns, "capacity", _number(fields[4]))
+                        _append(columns, "cost", _number(fields[5]))
+                elif kind == "n":
+                    fields = line.split()
+                    if problem == "max":
+                        if fields[2] == "s":
+                            source = int(fields[1])
+                        elif fields[2] == "t":
+                            sink = int(fields[1])
+                        else:
+                            raise ValueError("invalid node designator %s" % fields[2])
+                    else:
+                        demand[int(fields[1]) - 1] = -_number(fields[2])
+                elif kind == "p":
+                    if problem is not None:
+                        raise ValueError("%s contains more than one problem line" % path)
+                    fields = line.split()
+                    problem = fields[1]
+                    if not problem in ("max", "min"):
+                        raise ValueError("unsupported problem type %s" % problem)
+                    n = int(fields[2])
+                    columns["capacity"] = array("q")
+                    if problem == "min":
+                        columns["cost"] = array("q")
+                        demand = array("q", bytes(8 * n))
+                elif kind in ("c", ""):
+                    continue
+                else:
+                    raise ValueError("invalid line: %s" % line)
+
+    if problem is None:
+        raise ValueError("%s contains no problem line" % path)
+    node_columns = {} if demand is None else {"demand": demand}
+    graph = _build(list(range(1, n + 1)), sources, targets, columns, node_columns, False, frozen)
+    if not frozen:
+        source = None if source is None else graph.get_node(source)
+        sink = None if sink is None else graph.get_node(sink)
+    return graph, source, sink
+
+
+def read_csv(path, frozen = False, undirected = False, source = "source", target = "target",
+             attrs = None, delimiter = ","):
+    """
+    Reads an edge list from a CSV file with a header row.
+
+    Every row is an edge between the nodes named in the source and target
+    columns, the given attribute columns (all others by default) must contain
+    numbers and are stored as edge attributes. The rows are streamed straight
+    into typed arrays from which the graph is built at once, either a Graph
+    or, if frozen is true, a CSRGraph.
+    """
+    names = []
+    index = {}
+    sources = array("q")
+    targets = array("q")
+    columns = {}
+
+    with open(path, newline="") as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader)
+        first, second = header.index(source), header.index(target)
+        if attrs is None:
+            attrs = [name for name in header if not name in (source, target)]
+        fields = [(header.index(name), name) for name in attrs]
+        for name in attrs:
+            columns[name] = array("q")
+
+        for row in reader:
+            if not row:
+                continue
+            for pos, ends in ((first, sources), (second, targets)):
+                name = row[pos]
+                if not name in index:
+                    index[name] = len(names)
+                    names.append(name)
+                ends.append(index[name])
+            for pos, name in fields:
+                _append(columns, name, _number(row[pos]))
+
+    return _build(names, sources, targets, columns, {}, undirected, frozen)
+
+
+def write_dimacs(path, graph, source = None, sink = None):
+    """
+    Writes the graph as DIMACS max flow problem if a source and sink are
+    given, otherwise as min cost flow problem using the capacity and cost edge
+    attributes and the demand node attribute. Nodes are numbered by their
+    position in graph.nodes() starting at 1.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else graph.freeze(edge_attrs=("capacity", "cost"))
+    if not csr.is_directed():
+        raise ValueError("DIMACS files can only contain directed edges")
+    n = csr.node_count()
+    sources, targets, capacity = csr.sources, csr.targets, csr.capacity
+    arcs = csr.edge_arc
+
+    with open(path, "w") as f:
+        if source is not None:
+            f.write("p max %i %i\n" % (n, len(arcs)))
+            f.write("n %i s\n" % (csr.node_index(source) + 1))
+            f.write("n %i t\n" % (csr.node_index(sink) + 1))
+            f.writelines("a %i %i %s\n" % (sources[a] + 1, targets[a] + 1, capacity[a]) for a in arcs)
+        else:
+            demand, cost = csr.demand, csr.cost
+            f.write("p min %i %i\n" % (n, len(arcs)))
+            f.writelines("n %i %s\n" % (v + 1, -demand[v]) for v in range(n) if demand[v])
+            f.writelines("a %i %i 0 %s %s\n" % (sources[a] + 1, targets[a] + 1, capacity[a], cost[a])
+                         for a in arcs)
+
+
+def write_dimacs_flow(path, graph, value = None):
+    """
+    Writes the load attribute of every edge as DIMACS flow solution, preceded by
+    the solution value if given. Nodes are numbered as by write_dimacs().
+    """
+    index = dict((node, i + 1) for i, node in enumerate(graph.nodes()))
+    with open(path, "w") as f:
+        if value is not None:
+            f.write("s %s\n" % value)
+        f.writelines("f %i %i %s\n" % (index[edge._node1], index[edge._node2], getattr(edge, "load", 0))
+                     for edge in graph.edges())
+
+
+def write_csv(path, graph, attrs = None, source = "source", target = "target", delimiter = ","):
+    """
+    Writes the edges of the graph to a CSV file with a header row, one row per
+    edge containing the names of its end points and the given attributes (all
+    numeric ones by default, e.g. the load after solving a flow problem).
+    """
+    edges = graph.edges()
+    if attrs is None:
+        attrs = _numeric_attributes(edges)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        writer.writerow([source, target] + list(attrs))
+        writer.writerows([edge._node1.name(), edge._node2.name()] + [getattr(edge, name, "") for name in attrs]
+                         for edge in edges)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Tests for the bellman ford negative cycle search.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+import os
+import random
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "algorithms")]
+
+from graph import *
+from bellman_ford import bellman_ford_cycle
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def random_graph(seed):
+    """
+    Returns a random graph whose costs are made of node potentials and a
+    small random part, so only some of them contain negative cost cycles.
+    """
+    r = random.Random(seed)
+    n = r.randint(2, 20)
+    potential = [r.randint(0, 50) for v in range(n)]
+    fractional = r.random() < 0.3
+    g = Graph()
+    g.add_nodes(range(n))
+    for i in range(r.randint(1, 3 * n)):
+        u, v = r.sample(range(n), 2)
+        if not g.has_edge(u, v):
+            cost = r.randint(-3, 10) + potential[u] - potential[v]
+            if fractional:
+                cost *= 0.5
+            g.add_edge(u, v, {"cost" : cost})
+    if r.random() < 0.2:
+        u, v = r.sample(range(n), 2)
+        if not g.has_edge(u, v) and not g.has_edge(v, u):
+            g.add_undirected_edge(u, v, {"cost" : r.randint(-2, 5)})
+    return g
+
+
+class NegativeCycleTest(unittest.TestCase):
+
+    def assertNegativeCycle(self, g, cycle, seed):
+        edges = cycle.edges()
+        nodes = cycle.nodes()
+        self.assertIs(cycle.start(), cycle.end(), seed)
+        self.assertEqual(len(nodes), len(edges) + 1, seed)
+        for i, edge in enumerate(edges):
+            self.assertIn(edge, g.edges())
+            if edge.is_directed():
+                self.assertEqual((edge.source(), edge.destination()), (nodes[i], nodes[i + 1]), seed)
+            else:
+                self.assertEqual(set(edge.nodes()), set([nodes[i], nodes[i + 1]]), seed)
+        self.assertLess(sum( edge.cost for edge in edges ), 0, seed)
+
+    def test_python_backend(self):
+        found = 0
+        for seed in range(300):
+            g = random_graph(seed)
+            cycle = bellman_ford_cycle(g)
+            if cycle is not None:
+                self.assertNegativeCycle(g, cycle, seed)
+                found += 1
+        # the instances are a mix of both cases
+        self.assertTrue(0 < found < 300)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_matches_python(self):
+        for seed in range(300):
+            g = random_graph(seed)
+            csr = g.freeze(edge_attrs=("cost",))
+            expected = bellman_ford_cycle(csr)
+            cycle = bellman_ford_cycle(csr, "numpy")
+            self.assertEqual(cycle is None, expected is None, seed)
+            if cycle is not None:
+                self.assertNegativeCycle(g, cycle, seed)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            bellman_ford_cycle(random_graph(0), "fortran")
+
+
+if __name__ == "__main__":
+    unittest.main()
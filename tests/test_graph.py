@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Tests for the graph classes.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "algorithms")]
+
+from graph import *
+from min_cost_flow import solve_min_cost_flow
+
+
+class SchemaPickleTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        g = Graph(node_attrs=("demand",), edge_attrs=("capacity", "load"))
+        g.add_node("a", {"demand" : -1})
+        g.add_node("b", {"demand" : 1})
+        g.add_edge("a", "b", {"capacity" : 3})
+        g.add_undirected_edge("a", "b", {"capacity" : 4})
+
+        h = pickle.loads(pickle.dumps(g))
+        self.assertEqual(h.get_node("a").demand, -1)
+        self.assertEqual([edge.capacity for edge in h.edges()], [3, 4])
+        self.assertEqual([type(edge) for edge in h.edges()], [type(edge) for edge in g.edges()])
+        self.assertIs(type(h.get_node("b")), type(g.get_node("b")))
+
+        # the copy still follows the schema
+        h.add_edge("b", "a", {"capacity" : 1}).load = 1
+        with self.assertRaises(AttributeError):
+            h.edges()[0].weight = 1
+
+    def test_plain_round_trip(self):
+        g = Graph()
+        g.add_nodes(["a", "b"])
+        g.add_edge("a", "b", {"capacity" : 3, "label" : "x"})
+        h = pickle.loads(pickle.dumps(g))
+        self.assertEqual(h.edges()[0].label, "x")
+
+
+class GraphFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def random_graph(self):
+        g = Graph()
+        g.add_nodes(["a", "b", 3, "d"])
+        g.add_edge("a", "b", {"capacity" : 3, "cost" : -2, "weight" : 0.5})
+        g.add_edge("b", 3, {"capacity" : 2 ** 40, "cost" : 7, "weight" : 1.25})
+        g.add_undirected_edge(3, "d", {"capacity" : 4, "cost" : 1, "weight" : 2.0})
+        g.add_edge("d", "a", {"capacity" : 1, "cost" : 0, "weight" : 3.5})
+        g.get_node("a").demand = -2
+        g.get_node("d").demand = 2
+        return g
+
+    def assertSameSnapshot(self, h, csr, names):
+        self.assertEqual([node.name() for node in h.nodes()], names)
+        for name in CSRGraph._ARRAYS:
+            self.assertEqual(list(getattr(h, name)), list(getattr(csr, name)), name)
+        for name, column in csr.arc_columns.items():
+            self.assertEqual(list(h.arc_columns[name]), list(column), name)
+            self.assertEqual(h.arc_columns[name].format, column.format, name)
+        self.assertEqual(list(h.demand), list(csr.demand))
+
+    def test_save_and_load(self):
+        g = self.random_graph()
+        csr = g.freeze()
+        path = os.path.join(self.directory, "graph.bin")
+        g.save(path)
+        for mmap in (True, False):
+            h = Graph.load(path, mmap)
+            self.assertSameSnapshot(h, csr, ["a", "b", 3, "d"])
+            self.assertEqual([edge.is_directed() for edge in h.edges()], [True, True, False, True])
+            self.assertEqual([edge.weight for edge in h.edges()], [0.5, 1.25, 2.0, 3.5])
+            self.assertEqual(h.node(3).demand, 2)
+            # the solvers write the load, so it is always stored
+            self.assertEqual(set(h.arc_column("load")), set([0]))
+
+    def test_bytes(self):
+        csr = self.random_graph().freeze()
+        self.assertSameSnapshot(CSRGraph.from_bytes(csr.to_bytes()), csr, ["a", "b", 3, "d"])
+        self.assertSameSnapshot(CSRGraph.from_bytes(csr.to_bytes(names=False)), csr, [0, 1, 2, 3])
+
+    def test_invalid_files(self):
+        with self.assertRaises(ValueError):
+            CSRGraph.from_bytes(b"not a graph file")
+        g = Graph()
+        g.add_node(("a", 1))
+        with self.assertRaises(ValueError):
+            g.save(os.path.join(self.directory, "tuple.bin"))
+
+    def test_circulation_without_demands(self):
+        g = Graph()
+        g.add_nodes(["a", "b", "c"])
+        g.add_edge("a", "b", {"capacity" : 2, "cost" : -3})
+        g.add_edge("b", "c", {"capacity" : 3, "cost" : 1})
+        g.add_edge("c", "a", {"capacity" : 1, "cost" : 1})
+        path = os.path.join(self.directory, "circulation.graph")
+        g.save(path)
+
+        h = Graph.load(path)
+        self.assertEqual(list(h.demand), [0, 0, 0])
+        solve_min_cost_flow(g)
+        solve_min_cost_flow(h)
+        self.assertEqual([edge.load for edge in h.edges()], [edge.load for edge in g.edges()])
+        self.assertEqual([edge.load for edge in h.edges()], [1, 1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
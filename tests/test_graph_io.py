@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Tests for the DIMACS and CSV readers and writers.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "algorithms")]
+
+from graph import *
+from graph_io import *
+from max_flow import solve_max_flow
+from min_cost_flow import solve_min_cost_flow
+
+
+def random_graph(seed, n = 8):
+    r = random.Random(seed)
+    g = Graph()
+    g.add_nodes(range(n))
+    for u, v in zip(range(n), list(range(1, n)) + [0]):
+        g.add_edge(u, v, {"capacity" : 50, "cost" : r.randint(0, 9)})
+    for i in range(2 * n):
+        u, v = r.sample(range(n), 2)
+        if not g.has_edge(u, v):
+            g.add_edge(u, v, {"capacity" : r.randint(1, 20), "cost" : r.randint(-3, 9)})
+    g.get_node(0).demand = -10
+    g.get_node(n // 2).demand = 10
+    return g
+
+
+def outflow(node):
+    return (sum( edge.load for edge in node.outgoing_edges() ) -
+            sum( edge.load for edge in node.incoming_edges() ))
+
+
+def costs(g):
+    return sum( edge.load * edge.cost for edge in g.edges() )
+
+
+class DimacsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "instance")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, text, newline = "\n"):
+        with open(self.path, "w", newline="") as f:
+            f.write(text.replace("\n", newline))
+
+    def test_max_flow_round_trip(self):
+        for seed in range(10):
+            g = random_graph(seed)
+            s, t = g.get_node(0), g.get_node(5)
+            write_dimacs(self.path, g, s, t)
+            solve_max_flow(g, s, t)
+
+            h, source, sink = read_dimacs(self.path)
+            self.assertEqual((source.name(), sink.name()), (1, 6))
+            self.assertEqual([(edge.source().name(), edge.destination().name(), edge.capacity) for edge in h.edges()],
+                             [(edge.source().name() + 1, edge.destination().name() + 1, edge.capacity)
+                              for edge in g.edges()])
+            solve_max_flow(h, source, sink)
+            self.assertEqual(outflow(source), outflow(s), seed)
+
+            csr, source, sink = read_dimacs(self.path, frozen=True)
+            self.assertEqual((source, sink), (1, 6))
+            solve_max_flow(csr, source, sink)
+            self.assertEqual(outflow(csr.node(0)), outflow(s), seed)
+
+    def test_min_cost_flow_round_trip(self):
+        for seed in range(10):
+            g = random_graph(seed)
+            write_dimacs(self.path, g)
+            solve_min_cost_flow(g, method="simplex")
+
+            for frozen in (False, True):
+                h, source, sink = read_dimacs(self.path, frozen)
+                self.assertIsNone(source)
+                self.assertEqual([node.demand for node in h.nodes()],
+                                 [getattr(node, "demand", 0) for node in g.nodes()])
+                solve_min_cost_flow(h, method="simplex")
+                self.assertEqual(costs(h), costs(g), seed)
+
+    def test_flow_solution(self):
+        g = random_graph(0)
+        solve_min_cost_flow(g)
+        write_dimacs_flow(self.path, g, costs(g))
+        with open(self.path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[0], "s %i" % costs(g))
+        self.assertEqual(lines[1:], ["f %i %i %s" % (edge.source().name() + 1, edge.destination().name() + 1,
+                                                     edge.load) for edge in g.edges()])
+
+    def test_crlf_and_whitespace(self):
+        self.write("c a comment\n\np max 3 2\n n 1 s\nn 3 t\na 1 2 4\n  a 2 3 5.5  \n", "\r\n")
+        g, s, t = read_dimacs(self.path)
+        self.assertEqual([edge.capacity for edge in g.edges()], [4, 5.5])
+        solve_max_flow(g, s, t)
+        self.assertEqual(outflow(s), 4)
+
+    def test_missing_problem_line(self):
+        for text in ("c no problem\n", "n 1 s\np max 2 1\na 1 2 3\n", "n 1 -5\np min 2 1\n",
+                     "a 1 2 3\np max 2 1\n"):
+            self.write(text)
+            with self.assertRaisesRegex(ValueError, "problem line", msg=text):
+                read_dimacs(self.path)
+
+    def test_invalid_files(self):
+        for text in ("p max 2 1\np max 2 1\n", "p sp 2 1\n", "p min 2 1\na 1 2 1 3 1\n",
+                     "p max 2 1\nn 1 x\n", "p max 2 1\nx 1 2\n"):
+            self.write(text)
+            with self.assertRaises(ValueError, msg=text):
+                read_dimacs(self.path)
+
+
+class CsvTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "edges.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        g = Graph()
+        g.add_nodes(["a", "b", "c"])
+        g.add_edge("a", "b", {"capacity" : 3, "weight" : 0.5})
+        g.add_edge("b", "c", {"capacity" : 2 ** 40, "weight" : 2})
+        g.add_edge("c", "a", {"capacity" : 1, "weight" : -1.5, "label" : "x"})
+        write_csv(self.path, g)
+
+        for frozen in (False, True):
+            h = read_csv(self.path, frozen)
+            self.assertEqual([node.name() for node in h.nodes()], ["a", "b", "c"])
+            self.assertEqual([(edge.source().name(), edge.destination().name(), edge.capacity, edge.weight)
+                              for edge in h.edges()],
+                             [("a", "b", 3, 0.5), ("b", "c", 2 ** 40, 2), ("c", "a", 1, -1.5)])
+            self.assertFalse(hasattr(h.edges()[0], "label"))
+
+    def test_undirected_and_selected_attributes(self):
+        with open(self.path, "w", newline="") as f:
+            f.write("from;to;weight;capacity\r\n1;2;4;7\r\n\r\n2;3;1.5;8\r\n")
+        h = read_csv(self.path, frozen=True, undirected=True, source="from", target="to",
+                     attrs=("weight",), delimiter=";")
+        self.assertTrue(h.is_undirected())
+        self.assertEqual(sorted(h.arc_columns), ["weight"])
+        self.assertEqual([edge.weight for edge in h.edges()], [4, 1.5])
+        self.assertEqual([node.name() for node in h.nodes()], ["1", "2", "3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
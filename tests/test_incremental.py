@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Tests for the incremental flow solvers.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+import copy
+import os
+import random
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "algorithms")]
+
+from graph import *
+from max_flow import solve_max_flow
+from min_cost_flow import solve_min_cost_flow, is_valid_flow
+from incremental_max_flow import IncrementalMaxFlow
+from incremental_min_cost_flow import IncrementalMinCostFlow
+
+
+def random_network(r, n):
+    g = Graph()
+    g.add_nodes(range(n))
+    for i in range(3 * n):
+        u, v = r.sample(range(n), 2)
+        if not g.has_edge(u, v):
+            g.add_edge(u, v, {"capacity" : r.randint(0, 20), "cost" : r.randint(-5, 20)})
+    return g
+
+
+def outflow(g, n):
+    node = g.get_node(n)
+    return (sum( edge.load for edge in node.outgoing_edges() ) -
+            sum( edge.load for edge in node.incoming_edges() ))
+
+
+def costs(g):
+    return sum( edge.load * edge.cost for edge in g.edges() )
+
+
+class IncrementalMaxFlowTest(unittest.TestCase):
+
+    def check(self, g, s, t, value, seed):
+        # the loads written back are a valid flow of the returned value ...
+        for edge in g.edges():
+            self.assertTrue(0 <= edge.load <= edge.capacity, seed)
+        for v in range(len(g.nodes())):
+            if v != s and v != t:
+                self.assertEqual(outflow(g, v), 0, seed)
+        self.assertEqual(outflow(g, s), value, seed)
+
+        # ... which is as large as a cold solve finds
+        h = copy.deepcopy(g)
+        solve_max_flow(h, s, t)
+        self.assertEqual(outflow(h, s), value, seed)
+
+    def test_random_updates(self):
+        for seed in range(40):
+            r = random.Random(seed)
+            n = r.randint(3, 12)
+            g = random_network(r, n)
+            s, t = 0, n - 1
+            flow = IncrementalMaxFlow(g, s, t)
+            self.check(g, s, t, flow.value(), seed)
+
+            for step in range(15):
+                edges = g.edges()
+                changes = []
+                for edge in r.sample(edges, min(len(edges), r.randint(1, 3))):
+                    if r.random() < 0.5 and edge.load > 0:
+                        # below the current load, the flow has to be rerouted or drained
+                        changes.append((edge, r.randint(0, edge.load - 1)))
+                    else:
+                        changes.append((edge, r.randint(0, 25)))
+                value = flow.update(changes)
+                self.assertEqual(value, flow.value(), seed)
+                self.check(g, s, t, value, seed)
+
+
+class IncrementalMinCostFlowTest(unittest.TestCase):
+
+    def random_instance(self, r):
+        """
+        Returns a random network with a cycle of large capacity through all nodes
+        and balanced demands.
+        """
+        n = r.randint(3, 10)
+        g = random_network(r, n)
+        order = list(range(n))
+        r.shuffle(order)
+        for u, v in zip(order, order[1:] + order[:1]):
+            if g.has_edge(u, v):
+                g.get_edge(u, v).capacity = 100
+            else:
+                g.add_edge(u, v, {"capacity" : 100, "cost" : r.randint(0, 20)})
+        for node in g.nodes():
+            node.demand = 0
+        for i in range(r.randint(1, 3)):
+            u, v = r.sample(range(n), 2)
+            amount = r.randint(1, 10)
+            g.get_node(u).demand -= amount
+            g.get_node(v).demand += amount
+        return g
+
+    def expected(self, g):
+        """
+        Returns the costs found by a cold solve or None if it is infeasible.
+        """
+        h = copy.deepcopy(g)
+        try:
+            solve_min_cost_flow(h, method="simplex")
+        except ValueError:
+            return None
+        return costs(h)
+
+    def test_random_updates(self):
+        for seed in range(40):
+            r = random.Random(seed)
+            g = self.random_instance(r)
+            flow = IncrementalMinCostFlow(g)
+            self.assertTrue(is_valid_flow(g), seed)
+            self.assertEqual(flow.costs(), costs(g), seed)
+            self.assertEqual(flow.costs(), self.expected(g), seed)
+
+            for step in range(15):
+                nodes, edges = g.nodes(), g.edges()
+                demands, changed_costs, capacities = [], [], []
+                kind = r.randrange(3)
+                if kind == 0:
+                    u, v = r.sample(nodes, 2)
+                    amount = r.randint(-5, 5)
+                    demands = [(u, u.demand - amount), (v, v.demand + amount)]
+                elif kind == 1:
+                    changed_costs = [(edge, r.randint(-5, 20)) for edge in r.sample(edges, 2)]
+                else:
+                    for edge in r.sample(edges, 2):
+                        if edge.load > 0 and r.random() < 0.7:
+                            capacities.append((edge, r.randint(0, edge.load - 1)))
+                        else:
+                            capacities.append((edge, r.randint(0, 30)))
+
+                try:
+                    result = flow.update(demands, changed_costs, capacities)
+                except ValueError:
+                    result = None
+                else:
+                    self.assertTrue(is_valid_flow(g), seed)
+                    self.assertEqual(result, costs(g), seed)
+                self.assertEqual(result, self.expected(g), seed)
+
+    def test_infeasible_update_and_recovery(self):
+        for seed in range(20):
+            r = random.Random(seed)
+            g = self.random_instance(r)
+            flow = IncrementalMinCostFlow(g)
+
+            # more demand than any edge can bring to the node
+            v = r.choice(g.nodes())
+            old = v.demand
+            with self.assertRaises(ValueError):
+                flow.update(demands=[(v, old + 1000)])
+            self.assertIsNone(self.expected(g))
+
+            # the next change makes the problem feasible again
+            result = flow.update(demands=[(v, old)])
+            self.assertTrue(is_valid_flow(g), seed)
+            self.assertEqual(result, costs(g), seed)
+            self.assertEqual(result, self.expected(g), seed)
+
+
+if __name__ == "__main__":
+    unittest.main()
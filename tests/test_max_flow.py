@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Tests for the max flow solvers.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+import os
+import random
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "algorithms")]
+
+from graph import *
+from max_flow import _max_flow
+from dinic import _max_flow_dinic
+from tracing import Tracer
+
+
+def random_graph(seed, fractional = False):
+    r = random.Random(seed)
+    n = r.randint(2, 15)
+    g = Graph()
+    g.add_nodes(range(n))
+    for i in range(r.randint(1, 4 * n)):
+        u, v = r.sample(range(n), 2)
+        if not g.has_edge(u, v):
+            capacity = r.randint(0, 20)
+            if fractional:
+                # sums of these are rarely exact in floating point
+                capacity *= r.choice((0.1, 0.3, 0.7))
+            g.add_edge(u, v, {"capacity" : capacity})
+    return g.freeze(edge_attrs=("capacity",)), 0, n - 1
+
+
+def value(graph, flow, s):
+    return sum( flow[a] for a in range(graph.offsets[s], graph.offsets[s + 1]) )
+
+
+class AugmentTracer(Tracer):
+
+    def __init__(self):
+        self.amounts = []
+
+    def augment(self, amount):
+        self.amounts.append(amount)
+
+
+class EnginesTest(unittest.TestCase):
+
+    def assertValidFlow(self, graph, flow, s, t, seed):
+        for a in range(graph.arc_count()):
+            self.assertLessEqual(flow[a], graph.capacity[a] + 1e-9, seed)
+            self.assertEqual(flow[a], -flow[graph.reverse[a]], seed)
+        for v in range(graph.node_count()):
+            if v != s and v != t:
+                self.assertAlmostEqual(value(graph, flow, v), 0, msg=seed)
+
+    def test_dinic_matches_edmonds_karp(self):
+        for seed in range(300):
+            graph, s, t = random_graph(seed)
+            flow = _max_flow(graph, s, t, None, "dinic")
+            expected = _max_flow(graph, s, t, None, "edmonds_karp")
+            self.assertValidFlow(graph, flow, s, t, seed)
+            self.assertEqual(value(graph, flow, s), value(graph, expected, s), seed)
+
+    def test_dinic_fractional_capacities(self):
+        for seed in range(300):
+            graph, s, t = random_graph(seed, True)
+            flow = _max_flow(graph, s, t, None, "dinic")
+            expected = _max_flow(graph, s, t, None, "edmonds_karp")
+            self.assertValidFlow(graph, flow, s, t, seed)
+            self.assertAlmostEqual(value(graph, flow, s), value(graph, expected, s), msg=seed)
+
+    def test_dinic_rounding(self):
+        # the second augmentation over m -> t overshoots its capacity by one
+        # ulp, the arc has to count as saturated instead of being augmented
+        # by a negative amount
+        x, y = 0.27449387718704954, 2.5041213288033703
+        graph = CSRGraph.from_arrays(["s", "a", "b", "m", "t"], [0, 1, 0, 2, 3], [1, 3, 2, 3, 4],
+                                     {"capacity" : [x, 10, 10, 10, y]})
+        tracer = AugmentTracer()
+        _max_flow_dinic(graph, 0, 4, tracer)
+        self.assertEqual(len(tracer.amounts), 2)
+        self.assertTrue(all( amount > 0 for amount in tracer.amounts ))
+
+    def test_dinic_warm_start(self):
+        for seed in range(100):
+            graph, s, t = random_graph(seed)
+            # half of a maximum flow is a valid flow to start from
+            start = [f / 2 for f in _max_flow(graph, s, t, None, "edmonds_karp")]
+            flow = _max_flow_dinic(graph, s, t, None, start)
+            self.assertValidFlow(graph, flow, s, t, seed)
+            self.assertEqual(value(graph, flow, s), value(graph, _max_flow(graph, s, t, None, "dinic"), s), seed)
+
+    def test_capacity_scaling_matches_edmonds_karp(self):
+        for seed in range(300):
+            graph, s, t = random_graph(seed)
+            flow = _max_flow(graph, s, t, None, "capacity_scaling")
+            expected = _max_flow(graph, s, t, None, "edmonds_karp")
+            self.assertEqual(value(graph, flow, s), value(graph, expected, s), seed)
+
+
+class PushRelabelTest(unittest.TestCase):
+
+    def test_matches_edmonds_karp(self):
+        # small random graphs run into many gaps
+        for seed in range(300):
+            graph, s, t = random_graph(seed)
+            flow = _max_flow(graph, s, t, None, "push_relabel")
+            expected = _max_flow(graph, s, t, None, "edmonds_karp")
+            self.assertEqual(value(graph, flow, s), value(graph, expected, s), seed)
+            for v in range(graph.node_count()):
+                if v != s and v != t:
+                    self.assertEqual(value(graph, flow, v), 0, seed)
+
+
+if __name__ == "__main__":
+    unittest.main()
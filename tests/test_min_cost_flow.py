@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Tests for the min cost flow solvers.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "algorithms")]
+
+from graph import *
+from min_cost_flow import _feasible_flow_csr, solve_min_cost_flow, is_valid_flow
+from batch import solve_many
+
+METHODS = ("cycle_cancelling", "ssp", "simplex", "cost_scaling")
+
+
+def unbalanced_graph():
+    """
+    Returns a graph with more demand (7) than supply (3).
+    """
+    g = Graph()
+    g.add_node(0, {"demand" : -3})
+    g.add_node(1, {"demand" : 5})
+    g.add_node(2, {"demand" : 0})
+    g.add_node(3, {"demand" : 2})
+    g.add_edge(0, 1, {"capacity" : 10, "cost" : 1})
+    g.add_edge(0, 2, {"capacity" : 10, "cost" : 1})
+    g.add_edge(2, 3, {"capacity" : 10, "cost" : 1})
+    return g
+
+
+class FeasibleFlowTest(unittest.TestCase):
+
+    def test_demand_larger_than_supply(self):
+        csr = unbalanced_graph().freeze(edge_attrs=("capacity", "cost"))
+        with self.assertRaises(ValueError):
+            _feasible_flow_csr(csr, [0] * csr.arc_count())
+
+
+class SolveMinCostFlowTest(unittest.TestCase):
+
+    def test_unsatisfiable_demands(self):
+        for method in METHODS:
+            with self.assertRaises(ValueError, msg=method):
+                solve_min_cost_flow(unbalanced_graph(), method=method)
+
+    def test_valid_flow(self):
+        for method in METHODS:
+            g = unbalanced_graph()
+            g.get_node(1).demand = 1
+            solve_min_cost_flow(g, method=method)
+            self.assertTrue(is_valid_flow(g), method)
+
+    def test_snapshot_without_demand_column(self):
+        # a circulation: only the negative cycle a -> b -> c -> a carries flow
+        for method in METHODS:
+            csr = CSRGraph.from_arrays(["a", "b", "c"], [0, 1, 2], [1, 2, 0],
+                                       {"capacity" : [2, 3, 1], "cost" : [-3, 1, 1]})
+            solve_min_cost_flow(csr, method=method)
+            self.assertEqual([edge.load for edge in csr.edges()], [1, 1, 1], method)
+
+    def test_solve_many_reports_unsatisfiable_demands(self):
+        loads, error = list(solve_many([unbalanced_graph()], workers=0))[0]
+        self.assertIsNone(loads)
+        self.assertIsInstance(error, ValueError)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+#coding: UTF-8
+#
+# Tests for the min cut solvers.
+#
+# Copyright (c) 2013 Samuel Groß
+#
+
+import os
+import random
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "algorithms")]
+
+from graph import *
+from min_cut import solve_min_cut
+from karger_stein import solve_min_cut_karger_stein
+from gomory_hu import build_gomory_hu_tree
+from max_flow import _max_flow
+
+
+def random_graph(seed, attr = "weight"):
+    """
+    Returns a random connected graph with undirected edges.
+    """
+    r = random.Random(seed)
+    n = r.randint(2, 12)
+    g = Graph()
+    g.add_nodes(range(n))
+    for v in range(1, n):
+        g.add_undirected_edge(r.randrange(v), v, {attr : r.randint(1, 10)})
+    for i in range(r.randint(0, 2 * n)):
+        u, v = r.sample(range(n), 2)
+        if not g.has_edge(u, v):
+            g.add_undirected_edge(u, v, {attr : r.randint(1, 10)})
+    return g
+
+
+def cut_weight(g, side, attr = "weight"):
+    side = set(side)
+    return sum( getattr(edge, attr) for edge in g.edges()
+                if (edge.node1() in side) != (edge.node2() in side) )
+
+
+class KargerSteinTest(unittest.TestCase):
+
+    def test_matches_stoer_wagner(self):
+        for seed in range(100):
+            g = random_graph(seed)
+            value, side = solve_min_cut_karger_stein(g, 0.9999, workers=0, seed=seed)
+            self.assertEqual(value, solve_min_cut(g)[0], seed)
+            self.assertTrue(0 < len(side) < len(g.nodes()), seed)
+            self.assertEqual(cut_weight(g, side), value, seed)
+
+    def test_workers(self):
+        # every run is seeded by its number, the pool does not change the result
+        for seed in range(3):
+            g = random_graph(seed + 100)
+            expected = solve_min_cut_karger_stein(g, workers=0, seed=seed)
+            self.assertEqual(solve_min_cut_karger_stein(g, workers=2, seed=seed), expected)
+
+    def test_invalid_graphs(self):
+        g = Graph()
+        g.add_node(0)
+        with self.assertRaises(ValueError):
+            solve_min_cut_karger_stein(g, workers=0)
+        g.add_node(1)
+        g.add_edge(0, 1, {"weight" : 1})
+        with self.assertRaises(ValueError):
+            solve_min_cut_karger_stein(g, workers=0)
+
+
+class GomoryHuTest(unittest.TestCase):
+
+    def test_pair_cuts_match_max_flow(self):
+        for seed in range(40):
+            g = random_graph(seed, "capacity")
+            csr = g.freeze(edge_attrs=("capacity",))
+            tree = build_gomory_hu_tree(g, workers=0)
+            n = len(g.nodes())
+            self.assertEqual(len(tree.edges()), n - 1)
+            for u in range(n):
+                for v in range(u + 1, n):
+                    flow = _max_flow(csr, u, v, None, "edmonds_karp")
+                    expected = sum( flow[a] for a in range(csr.offsets[u], csr.offsets[u + 1]) )
+                    value, side = tree.min_cut(u, v)
+                    self.assertEqual(tree.min_cut_value(u, v), expected, seed)
+                    self.assertEqual(value, expected, seed)
+                    self.assertIn(g.get_node(u), side)
+                    self.assertNotIn(g.get_node(v), side)
+                    self.assertEqual(cut_weight(g, side, "capacity"), expected, seed)
+
+    def test_workers(self):
+        # the speculative batches must build the same tree as the sequential steps
+        for seed in range(3):
+            g = random_graph(seed + 100, "capacity")
+            expected = build_gomory_hu_tree(g, "dinic", workers=0)
+            tree = build_gomory_hu_tree(g, "dinic", workers=2)
+            self.assertEqual((tree.parent, tree.weight), (expected.parent, expected.weight), seed)
+
+    def test_invalid_pairs(self):
+        tree = build_gomory_hu_tree(random_graph(0, "capacity"), workers=0)
+        with self.assertRaises(ValueError):
+            tree.min_cut_value(0, 0)
+        with self.assertRaises(ValueError):
+            tree.min_cut(0, "missing")
+
+
+if __name__ == "__main__":
+    unittest.main()